@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import pygame as pg
+
+from audio import PCM_CACHE_DIR, load_sound
+from sprite_cache import SpriteCache
+
+# =====================
+# アセットの並行読み込み
+# =====================
+LOAD_WORKERS = 4  # 読み込みに使うスレッド数
+
+
+class AssetLoader:
+    """
+    画像・効果音・BGMをスレッドプールで並行して読み込むクラス
+    画像は読み込んだものをSpriteCacheに入れ、画像を使う前処理（変形済み画像の作成など）もプールで行う
+    効果音・BGMは読み込み途中でもゲームを始められるように、Futureのまま渡す
+    一度読み込んだものは使い回すので、同じプロセスで2回目以降に起動するときはすぐ終わる
+    """
+    def __init__(self, sprites: SpriteCache, workers: int = LOAD_WORKERS):
+        self.sprites = sprites
+        self.workers = workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.images: dict[str, Future] = {}
+        self.sounds: dict[str, Future] = {}
+        self.tasks: dict[str, Future] = {}  # 画像を使う前処理
+        self.pcm_hits: dict[str, bool] = {}  # 効果音 -> デコード済みのPCMをディスクから読めたか
+        self.times: dict[str, float] = {}  # 読み込み・前処理にかかった時間[秒]
+        self.start = self.finish = 0.0
+
+    def submit(self, name: str, fn, *args) -> Future:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="asset")
+            self.start = time.perf_counter()
+
+        def run():
+            t = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                now = time.perf_counter()
+                self.times[name] = now - t
+                self.finish = max(self.finish, now)
+        return self.executor.submit(run)
+
+    def load_image(self, path: str) -> pg.Surface:
+        return self.sprites.add(path, pg.image.load(path))
+
+    def image(self, path: str) -> Future:
+        """画像の読み込みを始める（読み込んだ画像はSpriteCacheに入る）"""
+        future = self.images.get(path)
+        if future is None:
+            future = self.images[path] = self.submit(path, self.load_image, path)
+        return future
+
+    def sound(self, path: str) -> Future:
+        """効果音の読み込み（デコード、2回目以降の起動ではデコード済みのキャッシュ）を始める"""
+        future = self.sounds.get(path)
+        if future is None:
+            future = self.sounds[path] = self.submit(path, load_sound, path, PCM_CACHE_DIR, self.pcm_hits)
+        return future
+
+    def music(self, path: str) -> Future:
+        """BGMの読み込みを始める"""
+        future = self.sounds.get(path)
+        if future is None:
+            future = self.sounds[path] = self.submit(path, pg.mixer.music.load, path)
+        return future
+
+    def after_images(self, name: str, fn, *args) -> Future:
+        """読み込み中の画像がすべて揃ってから、fnをプールで実行する（同じnameは1回だけ）"""
+        future = self.tasks.get(name)
+        if future is None:
+            images = list(self.images.values())
+
+            def run():
+                wait(images)
+                return fn(*args)
+            future = self.tasks[name] = self.submit(name, run)
+        return future
+
+    def required(self) -> list[Future]:
+        """ゲーム開始前に終わっている必要があるもの（画像と前処理）"""
+        return list(self.images.values()) + list(self.tasks.values())
+
+    def progress(self) -> tuple[int, int]:
+        """ゲーム開始前に必要なものの(終わった数, 全体の数)を返す"""
+        futures = self.required()
+        return sum(f.done() for f in futures), len(futures)
+
+    def ready(self) -> bool:
+        """画像と前処理が終わったか（失敗していたら例外を送出する）"""
+        futures = self.required()
+        if not all(f.done() for f in futures):
+            return False
+        for f in futures:
+            f.result()
+        return True
+
+    def stats(self) -> dict[str, object]:
+        """読み込んだ数と時間を返す"""
+        return {
+            "images": len(self.images), "tasks": len(self.tasks),
+            "sounds": f"{sum(f.done() for f in self.sounds.values())}/{len(self.sounds)}",
+            "decode_s": round(sum(self.times.values()), 3),
+            "wall_s": round(self.finish - self.start, 3) if self.finish else 0.0,
+        }
+
+
+def loaded(future: Future):
+    """読み込みが終わっていれば結果を、まだか失敗していればNoneを返す"""
+    if future.done() and future.exception() is None:
+        return future.result()
+    return None
@@ -0,0 +1,106 @@
+import pygame as pg
+
+# =====================
+# テクスチャアトラス
+# =====================
+ATLAS_SIZE = 1024  # 1ページの一辺[px]
+MAX_PAGES = 8  # ページ数の上限（超えた画像はアトラスに入れずにそのまま描く）
+MAX_ITEM = 128  # アトラスに入れる画像の最大の一辺[px]（背景などの大きな画像は入れない）
+PADDING = 1  # 画像の間の隙間[px]
+
+
+class Atlas:
+    """
+    小さな画像を大きなページ画像にシェルフ方式（高さごとの棚に左から詰める）で詰め込むクラス
+    元の画像 -> (ページ, ページ内の矩形) の索引を持ち、描画はページの一部を切り出してblitする
+    同じページからまとめて描くことで、たくさんの小さな画像を描くときのblit1回あたりの負担を減らす
+    """
+    def __init__(self, size: int = ATLAS_SIZE, max_pages: int = MAX_PAGES, max_item: int = MAX_ITEM):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_item = max_item
+        self.pages: list[pg.Surface] = []
+        self.shelves: list[list[int]] = []  # 各ページの棚 [y, 高さ, 次に置くx]
+        self.index: dict[pg.Surface, tuple[pg.Surface, pg.Rect]] = {}
+        self.full = 0  # 入りきらなかった数
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def fits(self, img: pg.Surface) -> bool:
+        """アトラスに入れる画像か（透明度付きの小さな画像だけを入れる）"""
+        w, h = img.get_size()
+        return 0 < w <= self.max_item and 0 < h <= self.max_item and bool(img.get_flags() & pg.SRCALPHA)
+
+    def place(self, w: int, h: int) -> tuple[int, pg.Rect] | None:
+        """w×hの領域を確保し、(ページ番号, 矩形)を返す（入らなければNone）"""
+        w, h = w + PADDING, h + PADDING
+        for p, shelves in enumerate(self.shelves):
+            # 高さが合う棚のうち無駄が一番少ないものに置く
+            best = None
+            for shelf in shelves:
+                if shelf[1] >= h and shelf[2] + w <= self.size and (best is None or shelf[1] < best[1]):
+                    best = shelf
+            if best is None:
+                top = shelves[-1][0] + shelves[-1][1] if shelves else 0
+                if top + h > self.size:
+                    continue
+                best = [top, h, 0]
+                shelves.append(best)
+            rect = pg.Rect(best[2], best[0], w - PADDING, h - PADDING)
+            best[2] += w
+            return p, rect
+        if len(self.pages) >= self.max_pages:
+            return None
+        page = pg.Surface((self.size, self.size), pg.SRCALPHA)
+        if pg.display.get_surface() is not None:
+            page = page.convert_alpha()  # 画面の形式に合わせる
+        self.pages.append(page)
+        self.shelves.append([])
+        return self.place(w - PADDING, h - PADDING)
+
+    def add(self, img: pg.Surface) -> bool:
+        """画像をアトラスに入れる（入れられたらTrue）"""
+        if img in self.index:
+            return True
+        if not self.fits(img):
+            return False
+        spot = self.place(*img.get_size())
+        if spot is None:
+            self.full += 1
+            return False
+        page, rect = self.pages[spot[0]], spot[1]
+        # 透明度を合成せずにそのまま写す（空のページとの最大値＝元の画素）
+        page.blit(img, rect, special_flags=pg.BLEND_RGBA_MAX)
+        self.index[img] = (page, rect)
+        return True
+
+    def remove(self, img: pg.Surface):
+        """imgを索引から消す（ページ上の領域は再利用しない）"""
+        self.index.pop(img, None)
+
+    def pack(self, images):
+        """まとめて入れる（背の高い順に詰めると棚の無駄が減る）"""
+        for img in sorted((img for img in images if self.fits(img)), key=lambda img: -img.get_height()):
+            self.add(img)
+
+    def source(self, img: pg.Surface) -> tuple[pg.Surface, pg.Rect | None]:
+        """imgを描くときのblit元（ページ, 矩形）を返す（アトラスになければ(img, None)）"""
+        return self.index.get(img) or (img, None)
+
+    def blit_items(self, sprites) -> list[tuple]:
+        """スプライトを描くための(blit元, 位置[, 切り出す矩形])のリストを返す（位置はその時点の値を写す）"""
+        index = self.index
+        items = []
+        for spr in sprites:
+            img = spr.image
+            entry = index.get(img)
+            if entry is None:
+                items.append((img, spr.rect.topleft))
+            else:
+                items.append((entry[0], spr.rect.topleft, entry[1]))
+        return items
+
+    def stats(self) -> dict[str, int]:
+        """ページ数・画像数・入りきらなかった数を返す"""
+        return {"pages": len(self.pages), "images": len(self.index), "full": self.full}
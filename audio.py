@@ -0,0 +1,125 @@
+import hashlib
+import os
+from collections import Counter
+
+import pygame as pg
+
+# =====================
+# 効果音の再生管理・デコード済み音声のキャッシュ
+# =====================
+PCM_CACHE_DIR = ".cache/audio"  # デコード済み音声の保存先
+DEFAULT_VOICES = 2  # 同時に鳴らせる数（効果音ごと、指定がないとき）
+
+
+def pcm_cache_path(path: str, cache_dir: str) -> str | None:
+    """デコード済み音声の保存先を返す（元ファイルとミキサーの設定が変わると別のファイルになる）"""
+    init = pg.mixer.get_init()
+    if init is None:
+        return None
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}:{init}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{name}.{digest}.pcm")
+
+
+def load_sound(path: str, cache_dir: str | None = PCM_CACHE_DIR, hits: dict[str, bool] | None = None) -> pg.mixer.Sound:
+    """
+    効果音を読み込む
+    初回はMP3などをデコードし、ミキサーの形式の生のPCMをcache_dirに保存する
+    2回目以降は保存したPCMをそのまま読み込むので、デコードしない
+    hits: 渡すと{path: 保存したPCMを使えたか}を記録する
+    """
+    cache = pcm_cache_path(path, cache_dir) if cache_dir else None
+    if cache is not None and os.path.exists(cache):
+        try:
+            with open(cache, "rb") as f:
+                snd = pg.mixer.Sound(buffer=f.read())
+            if hits is not None:
+                hits[path] = True
+            return snd
+        except (OSError, pg.error):
+            pass
+    if hits is not None:
+        hits[path] = False
+    snd = pg.mixer.Sound(path)
+    if cache is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(snd.get_raw())
+            os.replace(tmp, cache)
+        except OSError:
+            pass
+    return snd
+
+
+class Mixer:
+    """
+    効果音ごとに専用のチャンネルを予約し、同時に鳴る数を制限するクラス
+    play()は鳴らす予定を記録するだけで、flush()で1フレームに1回だけ鳴らす（同じフレームの同じ音はまとめる）
+    チャンネルがすべて使用中なら、一番前に鳴らし始めたものを止めて鳴らし直す
+    voices: {効果音名: 同時に鳴らせる数}
+    """
+    def __init__(self, voices: dict[str, int]):
+        self.voices = dict(voices)
+        self.channels: dict[str, list[pg.mixer.Channel]] = {}
+        self.started: dict[pg.mixer.Channel, int] = {}  # チャンネル -> 鳴らし始めたフレーム
+        self.pending: Counter[str] = Counter()  # このフレームに鳴らす予定の効果音
+        self.frame = 0
+        self.played = Counter()
+        self.coalesced = Counter()  # 同じフレームにまとめた数
+        self.stolen = Counter()  # 鳴っている音を止めて鳴らし直した数
+        self.reserve()
+
+    def reserve(self):
+        """効果音ごとのチャンネルを予約する（ミキサーが使えないときは何もしない）"""
+        if pg.mixer.get_init() is None:
+            return
+        total = sum(self.voices.values())
+        if pg.mixer.get_num_channels() < total:
+            pg.mixer.set_num_channels(total)
+        pg.mixer.set_reserved(total)
+        i = 0
+        for name, n in self.voices.items():
+            self.channels[name] = [pg.mixer.Channel(i + k) for k in range(n)]
+            i += n
+
+    def limit(self, name: str, voices: int):
+        """効果音nameの同時に鳴らせる数を変える（予約済みのチャンネルの範囲で）"""
+        self.voices[name] = voices
+
+    def play(self, name: str):
+        """効果音nameを鳴らす予定にする"""
+        if self.pending[name]:
+            self.coalesced[name] += 1
+        self.pending[name] += 1
+
+    def sound(self, name: str) -> pg.mixer.Sound | None:
+        """効果音nameの音声を返す（まだ読み込めていなければNone）"""
+        raise NotImplementedError
+
+    def flush(self):
+        """このフレームに予定された効果音を1つずつ鳴らす（毎フレーム呼ぶ）"""
+        self.frame += 1
+        if not self.pending:
+            return
+        for name in self.pending:
+            snd = self.sound(name)
+            channels = self.channels.get(name, [])[:self.voices.get(name, DEFAULT_VOICES)]
+            if snd is None or not channels:
+                continue
+            channel = next((ch for ch in channels if not ch.get_busy()), None)
+            if channel is None:
+                channel = min(channels, key=lambda ch: self.started.get(ch, 0))
+                self.stolen[name] += 1
+            channel.play(snd)
+            self.started[channel] = self.frame
+            self.played[name] += 1
+        self.pending.clear()
+
+    def stats(self) -> dict[str, int]:
+        """鳴らした数・まとめた数・止めて鳴らし直した数を返す"""
+        return {"played": sum(self.played.values()), "coalesced": sum(self.coalesced.values()),
+                "stolen": sum(self.stolen.values()), "channels": sum(map(len, self.channels.values()))}
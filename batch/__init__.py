@@ -0,0 +1,4 @@
+"""
+シードを変えたヘッドレスの自動プレイを全CPUコアで大量に実行し、結果を集計する
+python -m batch で実行し、集計結果をJSONで出力する（経験値・難易度の調整用）
+"""
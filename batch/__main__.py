@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 標準出力をJSONだけにするため、pygameの読み込み時のメッセージを出さない（ワーカープロセスにも引き継がれる）
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from batch.runner import aggregate, init_worker, play  # noqa: E402
+from budget import parse_caps  # noqa: E402
+
+SCRIPTS = ("Legend_kokaton", "musou_kokaton")
+MAX_FRAMES = 15000  # 1ゲームの最大フレーム数（5分、これより長く生き残ったゲームは打ち切る）
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m batch", description="自動プレイの一括実行と集計")
+    parser.add_argument("--games", type=int, default=200, help="プレイするゲーム数")
+    parser.add_argument("--seed", type=int, default=0, help="最初のゲームのシード（以降は1ずつ増やす）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="プロセス数（既定はCPUコア数）")
+    parser.add_argument("--frames", type=int, default=MAX_FRAMES, help="1ゲームの最大フレーム数")
+    parser.add_argument("--script", choices=SCRIPTS, default=SCRIPTS[0], help="プレイするゲーム")
+    parser.add_argument("--cap", action="append", default=[], metavar="GROUP=N",
+                        help="グループの出現数の上限（例: emys=80、noneで無制限、defaultで推奨値、複数指定可）")
+    parser.add_argument("--games-out", action="store_true", help="集計に加えてゲームごとの結果も出力する")
+    parser.add_argument("--out", default="-", help="JSONの出力先（既定は標準出力）")
+    args = parser.parse_args()
+    try:
+        caps = parse_caps(args.cap)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.games < 1 or args.workers < 1:
+        parser.error("--games and --workers must be positive")
+
+    seeds = range(args.seed, args.seed + args.games)
+    games = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.script,)) as executor:
+        futures = [executor.submit(play, seed, args.frames, caps) for seed in seeds]
+        for future in as_completed(futures):
+            games.append(future.result())
+            print(f"\r{len(games)}/{args.games} games", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    games.sort(key=lambda g: g["seed"])
+    summary = aggregate(games, args.workers, time.perf_counter() - start)
+
+    for name in ("survival_s", "level", "score", "frame_ms"):
+        s = summary[name]
+        print(f"{name:>10}: mean {s['mean']:<9} p10 {s['p10']:<9} p50 {s['p50']:<9} p90 {s['p90']:<9}"
+              f" max {s['max']}", file=sys.stderr)
+    print(f"game over {summary['gameover_rate']:.0%}  {summary['games_per_s']} games/s"
+          f"  efficiency {summary['efficiency']:.0%} ({summary['workers']} workers)", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "script": args.script, "seed": args.seed,
+            "frames": args.frames, "caps": caps,
+        },
+        "summary": summary,
+        **({"games": games} if args.games_out else {}),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
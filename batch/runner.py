@@ -0,0 +1,75 @@
+import importlib
+import os
+import statistics
+import time
+from collections import Counter
+
+from headless import AutoPilot, setup_headless
+from timestep import STEP
+
+# =====================
+# ワーカープロセスでの自動プレイと集計
+# =====================
+# ワーカープロセスごとに1回だけ読み込むゲーム本体と、プレイするゲームの決まり（画像・音声は同じプロセスのゲームで使い回す）
+game = None
+rules = None
+
+
+def init_worker(script: str):
+    """ワーカープロセスの初期化（ダミードライバでpygameを初期化し、ゲームのモジュールを読み込む）"""
+    global game, rules
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    setup_headless()
+    import pygame as pg
+    pg.init()
+    rules = importlib.import_module(script).RULES
+    game = importlib.import_module("kokaton")
+
+
+def play(seed: int, frames: int, caps: dict | None = None) -> dict:
+    """
+    シードseedの1ゲームを自動操縦で最後まで（最大framesフレーム）プレイし、結果を返す
+    """
+    inputs = AutoPilot(list(rules.delta), seed)
+    cpu = time.process_time()
+    stats = game.main(rules, headless=True, frames=frames, seed=seed, inputs=inputs, caps=caps)
+    cpu = time.process_time() - cpu
+    return {
+        "seed": seed, "gameover": stats["gameover"], "steps": stats["steps"],
+        "survival_s": round(stats["steps"] * STEP, 2), "level": stats["level"], "score": stats["score"],
+        "frame_ms": round(stats["elapsed"] / stats["frames"] * 1e3, 4) if stats["frames"] else 0.0,
+        "cpu_s": round(cpu, 4), "pid": os.getpid(),
+    }
+
+
+def summary(values: list[float]) -> dict[str, float]:
+    """平均・最小・10/50/90パーセンタイル・最大"""
+    if len(values) < 2:
+        v = values[0] if values else 0.0
+        return {"mean": v, "min": v, "p10": v, "p50": v, "p90": v, "max": v}
+    deciles = statistics.quantiles(values, n=10, method="inclusive")
+    return {
+        "mean": round(statistics.fmean(values), 3), "min": min(values),
+        "p10": round(deciles[0], 3), "p50": round(statistics.median(values), 3), "p90": round(deciles[-1], 3),
+        "max": max(values),
+    }
+
+
+def aggregate(games: list[dict], workers: int, wall: float) -> dict:
+    """
+    ゲームごとの結果を集計する
+    efficiency: 各ゲームのCPU時間の合計 / (全体の時間 × プロセス数)（1に近いほどプロセス数に比例して速くなっている）
+    """
+    busy = sum(g["cpu_s"] for g in games)
+    return {
+        "games": len(games), "workers": workers, "processes": len({g["pid"] for g in games}),
+        "wall_s": round(wall, 3), "games_per_s": round(len(games) / wall, 2) if wall else 0.0,
+        "efficiency": round(busy / (wall * workers), 3) if wall else 0.0,
+        "gameover_rate": round(sum(g["gameover"] for g in games) / len(games), 3) if games else 0.0,
+        "survival_s": summary([g["survival_s"] for g in games]),
+        "level": summary([g["level"] for g in games]),
+        "levels": dict(sorted(Counter(g["level"] for g in games).items())),
+        "score": summary([g["score"] for g in games]),
+        "frame_ms": summary([g["frame_ms"] for g in games]),
+    }
+
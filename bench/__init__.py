@@ -0,0 +1,4 @@
+"""
+ゲームエンジンのホットパスを個別に計測するベンチマーク
+python -m bench で実行し、結果をJSONで出力する
+"""
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# 標準出力をJSONだけにするため、pygameの読み込み時のメッセージを出さない
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from headless import setup_headless  # noqa: E402
+
+setup_headless()
+
+import pygame as pg  # noqa: E402
+
+from bench.hotpaths import BENCHMARKS, game, measure  # noqa: E402
+
+COUNTS = [10, 100, 1000, 10000]
+
+
+def compare(results: list[dict], baseline_path: str):
+    """以前の計測結果と比べて速度比を表示する"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["n"]): r["seconds"] for r in json.load(f)["results"]}
+    for r in results:
+        old = baseline.get((r["name"], r["n"]))
+        if old:
+            print(f"{r['name']:>16} n={r['n']:<6} {old * 1e3:10.3f} ms -> {r['seconds'] * 1e3:10.3f} ms"
+                  f"  x{old / r['seconds']:.2f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="ホットパスのマイクロベンチマーク")
+    parser.add_argument("names", nargs="*", help=f"実行するベンチマーク（省略時はすべて）: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--counts", type=int, nargs="+", default=COUNTS, help="エンティティ数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値を採用）")
+    parser.add_argument("--out", default="-", help="JSONの出力先（既定は標準出力）")
+    parser.add_argument("--compare", metavar="JSON", help="比較する以前の計測結果")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    pg.init()
+    pg.display.set_mode((game.WIDTH, game.HEIGHT))
+
+    results = []
+    for name in args.names or list(BENCHMARKS):
+        for n in args.counts:
+            r = measure(name, n, args.repeat)
+            print(f"{name:>16} n={n:<6} {r['seconds'] * 1e3:10.3f} ms  ({r['per_item_us']:.3f} us/item)",
+                  file=sys.stderr)
+            results.append(r)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pg.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.compare:
+        compare(results, args.compare)
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import math
+import random
+import time
+
+import pygame as pg
+
+import kokaton as game
+from atlas import Atlas
+from collision import MaskCache, groupcollide
+from Legend_kokaton import RULES  # ベンチマークはこうかとん伝説の決まりで動かす
+
+# =====================
+# 計測対象
+# =====================
+# 各ベンチマークはエンティティ数nを受け取り、計測したい処理（引数なしの関数）を返す
+# 準備処理は計測に含めない
+
+
+def place(sprite: pg.sprite.Sprite):
+    """スプライトを画面内のランダムな位置に置く"""
+    sprite.rect.center = random.randint(0, game.WIDTH), random.randint(0, game.HEIGHT)
+    return sprite
+
+
+def make_enemies(n: int, group: pg.sprite.AbstractGroup) -> list[game.Enemy]:
+    emys = [place(game.Enemy(level=5)) for _ in range(n)]
+    group.add(*emys)
+    return emys
+
+
+def bench_shoot(n: int):
+    """Bird.shoot: n発の同時発射と破棄（ビームの生成・プールへの返却）"""
+    bird = game.Bird(3, (225, 400), RULES)
+    bird.skill["multi"] = n - 1
+    bird.update_pattern()
+    beams = pg.sprite.Group()
+
+    def run():
+        bird.timer = bird.attack_interval
+        bird.shoot(beams)
+        for beam in beams.sprites():
+            beam.kill()
+    return run
+
+
+def bench_nearest_linear(n: int):
+    """get_nearest_target: n体から線形探索"""
+    bird = game.Bird(3, (225, 400), RULES)
+    targets = pg.sprite.Group()
+    make_enemies(n, targets)
+    return lambda: game.get_nearest_target(bird, targets)
+
+
+def bench_nearest_grid(n: int):
+    """get_nearest_target: n体からTargetGroupで探索"""
+    bird = game.Bird(3, (225, 400), RULES)
+    targets = game.TargetGroup()
+    make_enemies(n, targets)
+    return lambda: game.get_nearest_target(bird, targets)
+
+
+def random_volley(bird: game.Bird) -> list[tuple]:
+    """ランダムな向きに回したこうかとんの発射パターン"""
+    rad = random.uniform(0, 2 * math.pi)
+    return bird.pattern.volley((math.cos(rad), -math.sin(rad)))
+
+
+def make_beams(n: int) -> pg.sprite.Group:
+    bird = game.Bird(3, (225, 400), RULES)
+    beams = pg.sprite.Group()
+    for _ in range(n):
+        beams.add(place(game.Beam(bird, *random_volley(bird)[0])))
+    return beams
+
+
+def bench_beam_update_sprite(n: int):
+    """Beam.update: スプライト版ビームn発の移動・反射"""
+    beams = make_beams(n)
+    for beam in beams:
+        beam.reflect_count = 1 << 30
+    return beams.update
+
+
+def bench_beam_update_numpy(n: int):
+    """BeamArray.update: numpy版ビームn発の移動・反射"""
+    bird = game.Bird(3, (225, 400), RULES)
+    bird.skill["reflect"] = 1 << 30
+    bird.update_pattern()
+    beams = game.BeamArray(game.BEAM_IMG, game.sprites, game.WIDTH, game.HEIGHT)
+    for _ in range(n):
+        place(bird)
+        for volley in random_volley(bird):
+            beams.spawn(bird, *volley)
+    return beams.update
+
+
+def bench_collide_pygame(n: int):
+    """敵n体 × ビームn発: pg.sprite.groupcollide"""
+    emys = pg.sprite.Group()
+    make_enemies(n, emys)
+    beams = make_beams(n)
+    return lambda: pg.sprite.groupcollide(emys, beams, False, False)
+
+
+def bench_collide_grid(n: int):
+    """敵n体 × ビームn発: GridGroupのgroupcollide（グリッド更新を含む）"""
+    emys = game.GridGroup()
+    make_enemies(n, emys)
+    beams = make_beams(n)
+
+    def run():
+        emys.rebin()
+        groupcollide(emys, beams, False, False)
+    return run
+
+
+def bench_collide_mask(n: int):
+    """敵n体 × ビームn発: GridGroupで絞り込んだ組だけマスクで判定（マスクは作成済み）"""
+    emys = game.GridGroup()
+    make_enemies(n, emys)
+    beams = make_beams(n)
+    masks = MaskCache()
+
+    def run():
+        emys.rebin()
+        groupcollide(emys, beams, False, False, masks.collide)
+    run()  # マスクの作成は計測に含めない
+    return run
+
+
+def bench_draw_hp(n: int):
+    """Enemy.hp_bar: HPの減った敵n体のHPバーを1体ずつblitで描画（まとめて描く前の描き方）"""
+    screen = pg.display.get_surface()
+    emys = make_enemies(n, pg.sprite.Group())
+    for emy in emys:
+        emy.hp = random.randint(1, emy.max_hp - 1)
+
+    def run():
+        for emy in emys:
+            screen.blit(*emy.hp_bar())
+    return run
+
+
+def bench_draw_hp_batched(n: int):
+    """HPBars.draw: HPの減った敵n体のHPバーを1回のblitsで描画"""
+    screen = pg.display.get_surface()
+    emys = make_enemies(n, pg.sprite.Group())
+    for emy in emys:
+        emy.hp = random.randint(1, emy.max_hp - 1)
+    return lambda: game.hpbars.draw(screen, [emy.hp_bar() for emy in emys])
+
+
+def make_drawn_sprites(n: int) -> pg.sprite.Group:
+    """敵とビームを半分ずつ、画面の形式に変換した共有画像で用意する"""
+    game.sprites.convert()
+    group = pg.sprite.Group()
+    make_enemies(n // 2, group)
+    bird = game.Bird(3, (225, 400), RULES)
+    for _ in range(n - n // 2):
+        group.add(place(game.Beam(bird, *random_volley(bird)[0])))
+    return group
+
+
+def bench_draw_surfaces(n: int):
+    """Group.draw: 敵・ビームn体を1枚ずつの画像から描画"""
+    screen = pg.display.get_surface()
+    group = make_drawn_sprites(n)
+    return lambda: group.draw(screen)
+
+
+def bench_draw_atlas(n: int):
+    """Atlas.blit_items: 敵・ビームn体をアトラスから1回のblitsで描画（ゲームの描画と同じ）"""
+    screen = pg.display.get_surface()
+    group = make_drawn_sprites(n)
+    atlas = Atlas()
+    atlas.pack({spr.image for spr in group})
+    return lambda: screen.blits(atlas.blit_items(group))
+
+
+def bench_score(n: int):
+    """Score.update: スコア表示n回（毎回値が変わる）"""
+    screen = pg.display.get_surface()
+    score = game.Score()
+
+    def run():
+        for i in range(n):
+            score.value = i
+            score.update(screen)
+    return run
+
+
+def bench_background(n: int):
+    """背景画像の全画面blit n回"""
+    screen = pg.display.get_surface()
+    bg_img = pg.image.load("fig/universe.jpg")
+
+    def run():
+        for _ in range(n):
+            screen.blit(bg_img, [0, 0])
+    return run
+
+
+BENCHMARKS = {
+    "shoot": bench_shoot,
+    "nearest_linear": bench_nearest_linear,
+    "nearest_grid": bench_nearest_grid,
+    "beam_update_sprite": bench_beam_update_sprite,
+    "beam_update_numpy": bench_beam_update_numpy,
+    "collide_pygame": bench_collide_pygame,
+    "collide_grid": bench_collide_grid,
+    "collide_mask": bench_collide_mask,
+    "draw_hp": bench_draw_hp,
+    "draw_hp_batched": bench_draw_hp_batched,
+    "draw_surfaces": bench_draw_surfaces,
+    "draw_atlas": bench_draw_atlas,
+    "score": bench_score,
+    "background": bench_background,
+}
+
+
+def measure(name: str, n: int, repeat: int, min_time: float = 0.05) -> dict:
+    """
+    ベンチマークnameをエンティティ数nで計測する
+    1回の計測がmin_time秒以上になるまで反復回数を増やし、repeat回のうち最小値を採用する
+    """
+    random.seed(0)
+    run = BENCHMARKS[name](n)
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - t0 >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            run()
+        best = min(best, (time.perf_counter() - t0) / loops)
+    return {"name": name, "n": n, "loops": loops, "seconds": best, "per_item_us": best / n * 1e6}
@@ -0,0 +1,62 @@
+from collections import Counter
+
+import pygame as pg
+
+# =====================
+# エンティティ数の上限管理
+# =====================
+# グループごとの同時出現数の上限の推奨値（既定では上限を設けず、指定したときだけ使う）
+ENTITY_CAPS = {"beams": 5000, "emys": 120, "bombs": 200, "exps": 150, "heals": 5}
+
+
+def parse_caps(specs: list[str]) -> dict[str, int | None]:
+    """
+    ["emys=80", "beams=none"] のような指定を上限の辞書にする
+    "default" はENTITY_CAPSの全グループの上限（後に書いた指定で上書きできる）
+    """
+    caps = {}
+    for spec in specs:
+        if spec == "default":
+            caps.update(ENTITY_CAPS)
+            continue
+        name, _, value = spec.partition("=")
+        if name not in ENTITY_CAPS or not value:
+            raise ValueError(f"invalid cap: {spec}")
+        caps[name] = None if value.lower() == "none" else int(value)
+    return caps
+
+
+class EntityBudget:
+    """
+    グループごとのスプライト数に上限を設け、上限に達したら出現を抑えるクラス
+    敵は上限に達すると新しく出さずに、今いる一番弱い敵にHPを合算して強化する
+    上限はcapsで指定したグループだけに設ける（指定しなければ元のゲームと同じく無制限）
+    """
+    def __init__(self, caps: dict[str, int | None] | None = None):
+        self.caps = dict(caps or {})
+        self.throttled = Counter()  # 上限のため出現させなかった数
+        self.merged = 0  # 既存の敵に合算した数
+
+    def allow(self, name: str, group: pg.sprite.AbstractGroup) -> bool:
+        """groupにもう1体追加してよいかを返す（だめなら抑制数を数える）"""
+        cap = self.caps.get(name)
+        if cap is None or len(group) < cap:
+            return True
+        self.throttled[name] += 1
+        return False
+
+    def merge(self, emys: pg.sprite.AbstractGroup, hp: int):
+        """出せなかった敵のHPを、今いる一番弱い敵に合算する"""
+        if not emys:
+            return
+        weakest = min(emys, key=lambda emy: emy.max_hp)
+        weakest.max_hp += hp
+        weakest.hp += hp
+        self.merged += 1
+
+    def report(self, groups: dict[str, pg.sprite.AbstractGroup]) -> dict[str, dict]:
+        """グループごとの現在数・上限・抑制数を返す"""
+        return {
+            name: {"live": len(group), "cap": self.caps.get(name), "throttled": self.throttled[name]}
+            for name, group in groups.items()
+        }
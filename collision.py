@@ -0,0 +1,165 @@
+from collections import defaultdict
+
+import pygame as pg
+
+# =====================
+# 当たり判定（空間ハッシュ・ピクセル単位の判定）
+# =====================
+GRID_CELL = 64  # セルの一辺[px]（敵・ビームの画像サイズ程度）
+MAX_MASKS = 4096  # 作成済みマスクの保持上限
+
+
+class GridGroup(pg.sprite.Group):
+    """
+    一様グリッドの空間ハッシュで所属スプライトを管理するグループ
+    add()/kill()に合わせてグリッドへ登録・削除し、移動したスプライトだけを再登録する
+    """
+    def __init__(self, *sprites, cell_size: int = GRID_CELL):
+        self.cell_size = cell_size
+        self.cells: defaultdict[tuple[int, int], set] = defaultdict(set)
+        self.spans: dict[pg.sprite.Sprite, tuple[int, int, int, int]] = {}
+        self.order: dict[pg.sprite.Sprite, int] = {}  # グループへの追加順
+        self.seq = 0
+        super().__init__(*sprites)
+
+    def span(self, rect: pg.Rect) -> tuple[int, int, int, int]:
+        """rectが重なるセルの範囲(x0, y0, x1, y1)を返す"""
+        cs = self.cell_size
+        x0, y0 = rect.left // cs, rect.top // cs
+        return x0, y0, max(x0, (rect.right - 1) // cs), max(y0, (rect.bottom - 1) // cs)
+
+    def bin(self, sprite: pg.sprite.Sprite, span: tuple[int, int, int, int]):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells[(cx, cy)].add(sprite)
+
+    def unbin(self, sprite: pg.sprite.Sprite, span: tuple[int, int, int, int]):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                cell.discard(sprite)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if sprite in self.spans:
+            return
+        span = self.span(sprite.rect)
+        self.spans[sprite] = span
+        self.order[sprite] = self.seq
+        self.seq += 1
+        self.bin(sprite, span)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        span = self.spans.pop(sprite, None)
+        if span is not None:
+            del self.order[sprite]
+            self.unbin(sprite, span)
+
+    def rebin(self):
+        """前回登録時からセルをまたいだスプライトだけグリッドを更新する"""
+        for sprite, old in self.spans.items():
+            span = self.span(sprite.rect)
+            if span != old:
+                self.unbin(sprite, old)
+                self.bin(sprite, span)
+                self.spans[sprite] = span
+
+    def query(self, rect: pg.Rect) -> list[pg.sprite.Sprite]:
+        """rectと重なるスプライトをグループへの追加順で返す"""
+        x0, y0, x1, y1 = self.span(rect)
+        cells = self.cells
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        hits = [s for s in found if rect.colliderect(s.rect)]
+        if len(hits) > 1:
+            hits.sort(key=self.order.__getitem__)
+        return hits
+
+
+class MaskCache:
+    """
+    画像 -> pg.mask.Mask のキャッシュ（ピクセル単位の当たり判定用）
+    回転・縮小した画像はSpriteCacheが回転段階ごとに共有しているので、マスクも画像ごと（回転段階ごと）に1回だけ作る
+    矩形が重なった組（グリッドで絞り込んだ候補）だけをマスクで判定する
+    """
+    def __init__(self, max_entries: int = MAX_MASKS):
+        self.max_entries = max_entries
+        self.masks: dict[pg.Surface, pg.mask.Mask] = {}
+        self.hits = 0
+        self.misses = 0
+        self.tests = 0  # マスクで判定した組の数
+        self.rejected = 0  # 矩形は重なっていたがピクセルは重なっていなかった組の数
+
+    def mask(self, img: pg.Surface) -> pg.mask.Mask:
+        """画像の不透明な部分（透明度付きならアルファ127超、カラーキー付きならカラーキー以外）のマスクを返す"""
+        mask = self.masks.get(img)
+        if mask is not None:
+            self.hits += 1
+            return mask
+        self.misses += 1
+        if len(self.masks) >= self.max_entries:
+            self.masks.clear()
+        mask = self.masks[img] = pg.mask.from_surface(img)
+        return mask
+
+    def overlap(self, img_a: pg.Surface, pos_a: tuple[int, int], img_b: pg.Surface, pos_b: tuple[int, int]) -> bool:
+        """位置pos_aの画像img_aと位置pos_bの画像img_bの不透明な部分が重なっているか"""
+        self.tests += 1
+        offset = (pos_b[0] - pos_a[0], pos_b[1] - pos_a[1])
+        if self.mask(img_a).overlap(self.mask(img_b), offset) is not None:
+            return True
+        self.rejected += 1
+        return False
+
+    def collide(self, a: pg.sprite.Sprite, b: pg.sprite.Sprite) -> bool:
+        """spritecollide()/groupcollide()のcollidedに渡す判定（矩形が重なった組だけで呼ばれる）"""
+        return self.overlap(a.image, a.rect.topleft, b.image, b.rect.topleft)
+
+    def stats(self) -> dict[str, int]:
+        """キャッシュの利用統計と、判定した組・ピクセルで外れた組の数を返す"""
+        return {"entries": len(self.masks), "hits": self.hits, "misses": self.misses,
+                "tests": self.tests, "rejected": self.rejected}
+
+
+def spritecollide(sprite: pg.sprite.Sprite, group: GridGroup, dokill: bool, collided=None) -> list:
+    """pg.sprite.spritecollideのグリッド版（戻り値の順序も同じ）"""
+    hits = group.query(sprite.rect)
+    if collided is not None:
+        hits = [s for s in hits if collided(sprite, s)]
+    if dokill:
+        for s in hits:
+            s.kill()
+    return hits
+
+
+def groupcollide(groupa: GridGroup, groupb: pg.sprite.AbstractGroup,
+                 dokilla: bool, dokillb: bool, collided=None) -> dict:
+    """
+    pg.sprite.groupcollideのグリッド版
+    groupbの各スプライトでgroupaのグリッドを検索し、{groupaのスプライト: [groupbのスプライト, ...]}を返す
+    辞書のキーはgroupaの順、リストはgroupbの順に並ぶため、pygameと同じ結果になる
+    """
+    hits = defaultdict(list)
+    for b in groupb:
+        for a in groupa.query(b.rect):
+            if collided is None or collided(a, b):
+                hits[a].append(b)
+    order = groupa.order
+    crashed = {a: hits[a] for a in sorted(hits, key=order.__getitem__)}
+    if dokilla:
+        for a in crashed:
+            a.kill()
+    if dokillb:
+        for lst in crashed.values():
+            for b in lst:
+                b.kill()
+    return crashed
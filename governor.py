@@ -0,0 +1,89 @@
+from collections import deque
+
+# =====================
+# 描画品質の自動調整
+# =====================
+FRAME_BUDGET = 1 / 50  # 1フレームの処理時間の予算[秒]（clock.tick(50)の1フレーム）
+WINDOW = 30  # 判定に使う直近のフレーム数
+DEGRADE_AT = 1.0  # 直近の平均が予算のこの割合を超えたら1段階下げる
+RECOVER_AT = 0.7  # 直近の平均が予算のこの割合を下回り続けたら1段階戻す
+RECOVER_HOLD = 150  # 戻すまでに余裕が続く必要のあるフレーム数（すぐ戻して重くなるのを繰り返さない）
+# 品質を下げる段階（前から順に省き、戻すときは後ろから戻す）
+STAGES = (
+    "short_explosions",  # 爆発の表示時間を半分にする
+    "damage_text",  # 回復量などの数値表示を出さない
+    "hp_bars",  # 敵のHPバーを描かない
+    "voices",  # 効果音の同時に鳴らせる数を1にする
+    "explosions",  # 爆発を出さない
+)
+
+
+class QualityGovernor:
+    """
+    直近のフレームの処理時間から、ゲームの進行に関係ない演出を段階的に省くクラス
+    平均が予算を超えたら1段階下げ、十分な余裕がしばらく続いたら1段階戻す
+    level: 省いている段階の数（0なら全部表示）
+    """
+    def __init__(self, budget: float = FRAME_BUDGET, window: int = WINDOW, stages: tuple[str, ...] = STAGES):
+        self.budget = budget
+        self.stages = stages
+        self.times: deque[float] = deque(maxlen=window)
+        self.total = 0.0  # timesの合計
+        self.level = 0
+        self.calm = 0  # 余裕のあるフレームが続いた数
+        self.frames = 0
+        self.degraded = 0  # 品質を下げていたフレーム数
+        self.max_level = 0
+        self.changes = 0
+
+    def shed(self, stage: str) -> bool:
+        """stageの演出を省いているか"""
+        return self.stages.index(stage) < self.level
+
+    def frame(self, seconds: float) -> bool:
+        """
+        1フレームの処理時間[秒]（待ち時間を除く）を記録する
+        品質の段階が変わったらTrueを返す
+        """
+        self.frames += 1
+        if self.level:
+            self.degraded += 1
+        times = self.times
+        if len(times) == times.maxlen:
+            self.total -= times[0]
+        times.append(seconds)
+        self.total += seconds
+        if len(times) < times.maxlen:
+            return False
+        mean = self.total / len(times)
+        if mean > self.budget * DEGRADE_AT:
+            self.calm = 0
+            if self.level < len(self.stages):
+                self.set_level(self.level + 1)
+                return True
+            return False
+        self.calm = self.calm + 1 if mean < self.budget * RECOVER_AT else 0
+        if self.calm >= RECOVER_HOLD and self.level:
+            self.set_level(self.level - 1)
+            return True
+        return False
+
+    def set_level(self, level: int):
+        """段階を変え、新しい段階で測り直す"""
+        self.level = level
+        self.max_level = max(self.max_level, level)
+        self.changes += 1
+        self.calm = 0
+        self.times.clear()
+        self.total = 0.0
+
+    def describe(self) -> str:
+        """現在の段階（省いている最後の演出の名前）"""
+        return f"{self.level}/{len(self.stages)}" + (f" (-{self.stages[self.level - 1]})" if self.level else "")
+
+    def stats(self) -> dict[str, object]:
+        """現在の段階・最も下げた段階・切り替えた回数・品質を下げていたフレームの割合を返す"""
+        return {
+            "level": self.level, "max_level": self.max_level, "changes": self.changes,
+            "degraded": round(self.degraded / self.frames, 3) if self.frames else 0.0,
+        }
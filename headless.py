@@ -0,0 +1,117 @@
+import os
+import random
+
+# =====================
+# ヘッドレス実行（ウィンドウ・音声・人の入力なし）
+# =====================
+
+
+def setup_headless():
+    """SDLのダミードライバを使うように設定する（pg.init()より前に呼ぶ）"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class KeyState:
+    """pg.key.get_pressed()の代わりに使うキー状態"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class NullInput:
+    """何も操作しない入力。スキル選択では常に先頭の候補を選ぶ"""
+    def keys(self, frame: int) -> KeyState:
+        return KeyState()
+
+    def choose(self, choices: list[str]) -> str:
+        return choices[0]
+
+    def finished(self, step: int) -> bool:
+        """入力が終わったか（記録の再生用、ここでは常にFalse）"""
+        return False
+
+
+class ScriptedInput(NullInput):
+    """
+    フレーム番号ごとに押すキーを決めた入力
+    script: {フレーム番号: 押すキーのリスト}（次の指定までキーを押し続ける）
+    skills: スキル選択で選ぶスキル名のリスト（使い切ったら先頭の候補を選ぶ）
+    """
+    def __init__(self, script: dict[int, list[int]], skills: list[str] = ()):
+        self.script = sorted(script.items())
+        self.skills = list(skills)
+        self.state = KeyState()
+
+    def keys(self, frame: int) -> KeyState:
+        while self.script and self.script[0][0] <= frame:
+            self.state = KeyState(self.script.pop(0)[1])
+        return self.state
+
+    def choose(self, choices: list[str]) -> str:
+        while self.skills:
+            skill = self.skills.pop(0)
+            if skill in choices:
+                return skill
+        return choices[0]
+
+
+class AutoPilot(NullInput):
+    """
+    乱数で操縦する入力（大量に自動プレイするとき用）
+    ランダムな方向への移動と、その場で止まっての自動射撃を交互に繰り返し、スキルはランダムに選ぶ
+    ゲームとは別の乱数を使うので、seedが同じなら毎回同じ操作になる
+    keys: 上・下・左・右の移動キー（斜め移動は上下と左右の組み合わせ）
+    move, rest: 移動・停止を続けるステップ数の範囲
+    """
+    def __init__(self, keys: list[int], seed: int | None = None,
+                 move: tuple[int, int] = (10, 40), rest: tuple[int, int] = (20, 80)):
+        up, down, left, right = keys
+        self.directions = [(k,) for k in keys] + [(v, h) for v in (up, down) for h in (left, right)]
+        self.rng = random.Random(seed)
+        self.move, self.rest = move, rest
+        self.moving = False
+        self.until = 0
+        self.state = KeyState()
+
+    def keys(self, frame: int) -> KeyState:
+        if frame >= self.until:
+            self.moving = not self.moving
+            self.until = frame + self.rng.randint(*(self.move if self.moving else self.rest))
+            self.state = KeyState(self.rng.choice(self.directions) if self.moving else ())
+        return self.state
+
+    def choose(self, choices: list[str]) -> str:
+        return self.rng.choice(choices)
+
+
+def startup_line(startup: dict) -> str:
+    """起動の種類（cold/warm）と読み込み時間の1行（ウィンドウ表示で遊んだときも終了時に表示する）"""
+    return (f"startup ({startup['mode']}, memory={startup['memory']}, disk={startup['disk']}):"
+            f" ready {startup['ready_s']:.3f}s  "
+            + "  ".join(f"{k}={v}" for k, v in startup["assets"].items()))
+
+
+def report(stats: dict):
+    """ヘッドレス実行の結果を表示する"""
+    print(f"frames: {stats['frames']}  time: {stats['elapsed']:.2f}s  fps: {stats['fps']:.1f}")
+    print(f"score: {stats['score']}  level: {stats['level']}  hp: {stats['hp']}"
+          + ("  (game over)" if stats["gameover"] else ""))
+    print("entities: " + "  ".join(f"{k}={v}" for k, v in stats["entities"].items()))
+    if "budget" in stats:
+        print("budget: " + "  ".join(f"{k}={v['live']}/{'none' if v['cap'] is None else v['cap']}(-{v['throttled']})"
+                                     for k, v in stats["budget"].items()))
+    if "audio" in stats:
+        print("audio: " + "  ".join(f"{k}={v}" for k, v in stats["audio"].items()))
+    for name, pool in stats["pools"].items():
+        print(f"pool {name}: " + "  ".join(f"{k}={v}" for k, v in pool.items()))
+    if "startup" in stats:
+        print(startup_line(stats["startup"]))
+    if "quality" in stats:
+        print("quality: " + "  ".join(f"{k}={v}" for k, v in stats["quality"].items()))
+    if "pipeline" in stats:
+        print("pipeline: " + "  ".join(f"{k}={v}" for k, v in stats["pipeline"].items()))
+    for name, cache in stats.get("caches", {}).items():
+        print(f"cache {name}: " + "  ".join(f"{k}={v}" for k, v in cache.items()))
@@ -0,0 +1,57 @@
+import pygame as pg
+
+# =====================
+# HPバーのまとめ描き
+# =====================
+MAX_BARS = 2048  # 描画済みバー画像の保持上限
+
+
+class HPBars:
+    """
+    HPバーを(幅, 高さ, 残量の幅, 色, 背景色)ごとに描画済みの画像として持ち、全員分を1回のblitsで描くクラス
+    残量の幅は1px単位に量子化する（pg.draw.rectと同じく切り捨て）ので、1本ずつ描くのと同じ見た目になる
+    """
+    def __init__(self, max_entries: int = MAX_BARS):
+        self.max_entries = max_entries
+        self.images: dict[tuple, pg.Surface] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, width: int, height: int, fill: int, color, bg=None) -> pg.Surface:
+        """残量fill[px]のバー画像を返す（bgがNoneなら残量の部分だけの画像）"""
+        key = (width, height, fill, color, bg)  # 色はタプルで渡す
+        img = self.images.get(key)
+        if img is not None:
+            self.hits += 1
+            return img
+        self.misses += 1
+        img = pg.Surface((width if bg else fill, height))
+        if pg.display.get_surface() is not None:
+            img = img.convert()
+        if bg:
+            img.fill(bg)
+        img.fill(color, (0, 0, fill, height))
+        if len(self.images) >= self.max_entries:
+            self.images.clear()
+        self.images[key] = img
+        return img
+
+    def bar(self, x: int, y: int, width: int, height: int, ratio: float, color, bg=None):
+        """
+        (x, y)に描く幅width・残量ratioのバーを(画像, 位置)で返す（描くものがなければNone）
+        """
+        fill = int(width * max(ratio, 0))
+        if width <= 0 or height <= 0 or (fill <= 0 and not bg):
+            return None
+        return self.image(width, height, fill, color, bg), (x, y)
+
+    def draw(self, screen: pg.Surface, bars) -> list[pg.Rect]:
+        """
+        bar()の戻り値のリストをまとめて描き、描いた矩形のリストを返す（Noneは飛ばす）
+        ベンチマーク用（ゲームではGame.snapshot()がbar()の戻り値を他の画像と同じblitsに入れて描く）
+        """
+        return screen.blits([b for b in bars if b is not None])
+
+    def stats(self) -> dict[str, int]:
+        """キャッシュの利用統計を返す"""
+        return {"entries": len(self.images), "hits": self.hits, "misses": self.misses}
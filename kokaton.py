@@ -0,0 +1,1162 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from typing import NamedTuple
+
+import pygame as pg
+
+from assets import AssetLoader, loaded
+from atlas import Atlas
+from audio import Mixer
+from budget import EntityBudget, parse_caps
+from collision import GridGroup, MaskCache, groupcollide, spritecollide
+from headless import NullInput, report, setup_headless, startup_line
+from governor import QualityGovernor
+from hpbars import HPBars
+from patterns import PatternCache, Shot
+from perf import FrameTimer, PerfOverlay
+from pipeline import SimThread, Snapshot
+from pool import PooledSprite, SpritePool
+from projectiles import BeamArray
+from render import RENDER_MODES, Renderer
+from replay import Recorder, ReplayDiverged, ReplayInput
+from sprite_cache import SpriteCache
+from targeting import TargetGroup
+from text_cache import TextCache
+from timestep import MAX_STEPS, FixedTimestep, interpolated
+from tracing import TRACE_FORMATS, NullTracer, Tracer
+
+# =====================
+# 基本設定・定数
+# =====================
+WIDTH = 550  # ゲームウィンドウの幅
+HEIGHT = 750  # ゲームウィンドウの高さ
+AUTO_FIRE_INTERVAL = 20
+FPS = 50  # 描画の上限フレームレート
+BEAM_IMG = "fig/star.png"  # ビーム画像
+BG_IMG = "fig/universe.jpg"  # 背景画像
+# オブジェクトプールの保持上限（kill()されたスプライトを再利用する数）
+POOL_SIZES = {"beam": 1024, "bomb": 256, "explosion": 128, "damage_text": 32}
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Rules(NamedTuple):
+    """ゲームごとに違う決まり（Legend_kokaton.py・musou_kokaton.pyがそれぞれ作ってcli()・main()に渡す）"""
+    delta: dict[int, tuple[int, int]]  # 移動キー -> 移動方向
+    fire_while_moving: bool  # 移動キーを押している間もオートで撃つか
+    beam_reflect_img: str = BEAM_IMG  # 上下の端で反射した後のビーム画像（左右の端で反射するとBEAM_IMGに戻る）
+
+
+sprites = SpriteCache()  # 画像キャッシュ（全クラスで共有）
+texts = TextCache()  # 描画済み文字のキャッシュ（全クラスで共有）
+assets = AssetLoader(sprites)  # 画像・音声の並行読み込み
+hpbars = HPBars()  # 描画済みHPバーのキャッシュ（全員分をまとめて描く）
+masks = MaskCache()  # 画像ごとの当たり判定用マスク（--pixel-collideのとき）
+patterns = PatternCache()  # スキルレベルごとに事前計算した発射パターン
+
+# スキル名辞書
+SKILL_NAME_MAP = {
+    "multi": "連射数UP", 
+    "spread": "拡散攻撃", 
+    "pierce": "貫通弾", 
+    "reflect": "反射弾", 
+    "speed": "弾速UP",
+    "damage": "攻撃力UP"
+}
+
+# 日本語フォントの候補（先頭から順に探す）
+JP_FONTS = ["notosanscjkjp", "meiryo", "yu gothic", "hiraginosans", "msgothic", "arial"]
+
+def get_jp_font(size):
+    """日本語フォントを読み込む（環境に合わせてフォールバック、検索結果はキャッシュする）"""
+    return texts.sysfont(JP_FONTS, size)
+
+def check_bound(obj_rct: pg.Rect) -> tuple[bool, bool]:
+    """
+    オブジェクトが画面内or画面外を判定し，真理値タプルを返す関数
+    戻り値：横方向，縦方向のはみ出し判定結果（画面内：True／画面外：False）
+    """
+    yoko, tate = True, True
+    if obj_rct.left < 0 or WIDTH < obj_rct.right:
+        yoko = False
+    if obj_rct.top < 0 or HEIGHT < obj_rct.bottom:
+        tate = False
+    return yoko, tate
+
+def calc_orientation(org: pg.Rect, dst: pg.Rect) -> tuple[float, float]:
+    """orgから見てdstがどこにあるかを計算し、正規化された方向ベクトルを返す"""
+    x_diff, y_diff = dst.centerx - org.centerx, dst.centery - org.centery
+    norm = math.sqrt(x_diff**2 + y_diff**2)
+    if norm == 0: return 0, 0
+    return x_diff/norm, y_diff/norm
+
+def get_nearest_target(bird, targets):
+    """一番近くにあるターゲット（敵または爆弾）を取得する"""
+    if isinstance(targets, TargetGroup):
+        return targets.nearest(bird.rect.center)
+    nearest = None
+    min_dist = float('inf')
+    for t in targets:
+        dx = t.rect.centerx - bird.rect.centerx
+        dy = t.rect.centery - bird.rect.centery
+        dist = dx*dx + dy*dy
+        if dist < min_dist:
+            min_dist = dist
+            nearest = t
+    return nearest
+
+# =====================
+# UI クラス・関数
+# =====================
+def draw_exp_bar(screen, bird) -> pg.Rect:
+    """画面上部に経験値バーとレベルを表示し、描画した範囲を返す"""
+    bar_x, bar_y = 20, 20
+    bar_w, bar_h = WIDTH - 200, 20
+    
+    # レベルアップに必要な経験値に対する割合
+    ratio = bird.exp / bird.next_exp
+    fill_w = int(bar_w * ratio)
+    
+    bar = pg.draw.rect(screen, (50, 50, 50), [bar_x, bar_y, bar_w, bar_h])
+    pg.draw.rect(screen, (0, 200, 255), [bar_x, bar_y, fill_w, bar_h])
+    pg.draw.rect(screen, (255, 255, 255), [bar_x, bar_y, bar_w, bar_h], 2)
+    
+    txt = texts.render(f"Lv.{bird.level}", 40, (255, 255, 255))
+    return bar.union(screen.blit(txt, (bar_w + 30, 15)))
+
+def draw_player_hp(screen, bird):
+    """画面左上にプレイヤーのHPバーを表示"""
+    bar_x, bar_y = 20, 50  # 経験値バー(y=20)の下に表示
+    bar_w, bar_h = 200, 15
+    
+    # HPの割合計算
+    ratio = bird.hp / bird.max_hp
+    if ratio < 0: ratio = 0
+    fill_w = int(bar_w * ratio)
+    
+    # バーの背景（暗い赤）
+    pg.draw.rect(screen, (50, 0, 0), [bar_x, bar_y, bar_w, bar_h])
+    # HP残量（明るい赤）
+    pg.draw.rect(screen, (255, 0, 0), [bar_x, bar_y, fill_w, bar_h])
+    # 枠線（白）
+    pg.draw.rect(screen, (255, 255, 255), [bar_x, bar_y, bar_w, bar_h], 2)
+    
+    # 文字表示
+    txt = texts.render(f"HP: {int(bird.hp)}/{bird.max_hp}", 24, (255, 255, 255))
+    screen.blit(txt, (bar_x + bar_w + 10, bar_y))
+
+def draw_loading(screen, done, total):
+    """アセット読み込み中の画面（進み具合のバー）を描画"""
+    screen.fill((0, 0, 0))
+    bar = pg.Rect(WIDTH//2 - 150, HEIGHT//2, 300, 16)
+    pg.draw.rect(screen, (0, 200, 255), [bar.x, bar.y, bar.w * done // max(total, 1), bar.h])
+    pg.draw.rect(screen, (255, 255, 255), bar, 2)
+    txt = texts.render(f"Loading... {done}/{total}", 30, (255, 255, 255))
+    screen.blit(txt, (WIDTH//2 - txt.get_width()//2, bar.y - 40))
+
+def draw_skill_select(screen, choices):
+    """レベルアップ時のスキル選択画面を描画"""
+    overlay = pg.Surface((WIDTH, HEIGHT))
+    overlay.set_alpha(180)
+    overlay.fill((0, 0, 0))
+    screen.blit(overlay, (0, 0))
+    
+    jp_font = texts.sysfont_path(JP_FONTS)
+    
+    title = texts.render("LEVEL UP!", 60, (255, 255, 0), name=jp_font)
+    screen.blit(title, (WIDTH//2 - title.get_width()//2, 100))
+    
+    msg = texts.render("能力を選択してください", 30, (200, 200, 200), name=jp_font)
+    screen.blit(msg, (WIDTH//2 - msg.get_width()//2, 180))
+
+    rects = []
+    start_y = 250
+    for i, skill_key in enumerate(choices):
+        skill_name = SKILL_NAME_MAP.get(skill_key, skill_key)
+        rect = pg.Rect(WIDTH//2 - 200, start_y + i * 100, 400, 80)
+        
+        m_pos = pg.mouse.get_pos()
+        # ホバー時の色変化
+        if rect.collidepoint(m_pos):
+            color = (100, 100, 180) 
+            pg.draw.rect(screen, (255, 255, 0), rect, 3, border_radius=10)
+        else:
+            color = (60, 60, 80)
+            pg.draw.rect(screen, (255, 255, 255), rect, 2, border_radius=10)
+            
+        pg.draw.rect(screen, color, rect, border_radius=10)
+        
+        text = texts.render(skill_name, 30, (255, 255, 255), name=jp_font)
+        screen.blit(text, (rect.centerx - text.get_width()//2, rect.centery - text.get_height()//2))
+        rects.append((rect, skill_key))
+        
+    return rects
+
+# =====================
+# ゲームオブジェクト
+# =====================
+class Bird(pg.sprite.Sprite):
+    """ゲームキャラクター（こうかとん）に関するクラス（操作キーなどはrulesに従う）"""
+    @staticmethod
+    def load_imgs(num: int) -> dict[tuple[int, int], pg.Surface]:
+        """向きごとの画像（8方向）を返す（作った画像はspritesにキャッシュされる）"""
+        path = f"fig/{num}.png"
+        zoom = ("zoom", 0, 0.9)  # 基本画像（0.9倍）
+        flip = ("flip", True, False)  # 右向き画像
+        return {
+            (+1, 0): sprites.variant(path, zoom, flip),
+            (+1, -1): sprites.variant(path, zoom, flip, ("zoom", 45, 0.9)),
+            (0, -1): sprites.variant(path, zoom, flip, ("zoom", 90, 0.9)),
+            (-1, -1): sprites.variant(path, zoom, ("zoom", -45, 0.9)),
+            (-1, 0): sprites.variant(path, zoom),
+            (-1, +1): sprites.variant(path, zoom, ("zoom", 45, 0.9)),
+            (0, +1): sprites.variant(path, zoom, flip, ("zoom", -90, 0.9)),
+            (+1, +1): sprites.variant(path, zoom, flip, ("zoom", -45, 0.9)),
+        }
+
+    def __init__(self, num: int, xy: tuple[int, int], rules: Rules):
+        super().__init__()
+        self.rules = rules
+        self.imgs = __class__.load_imgs(num)
+        self.dire = (+1, 0)
+        self.image = self.imgs[self.dire]
+        self.rect = self.image.get_rect(center=xy)
+        self.speed = 10
+        self.max_hp = 100       # 最大HP
+        self.hp = self.max_hp   # 現在のHP
+        # --- スキル・ステータス関連 ---
+        self.level = 1
+        self.exp = 0
+        self.next_exp = 100
+        # スキルレベル管理
+        self.skill = {
+            "multi": 0, "spread": 0, "pierce": 0, "reflect": 0,
+            "speed": 0, "damage": 0
+        }
+        self.pattern_name = "fan"  # 発射パターン（patterns.PATTERNSのキー）
+        self.update_pattern()
+        
+        self.attack_interval = 40  # 攻撃間隔（フレーム）
+        self.timer = 0
+        
+        # 攻撃の狙いを定めるためのベクトル（オートエイム用）
+        self.aim_vec = (1, 0)
+
+    def gain_exp(self, amount):
+        """経験値を獲得し、レベルアップ判定を行う"""
+        self.exp += amount
+        if self.exp >= self.next_exp:
+            self.exp -= self.next_exp
+            self.level += 1
+            self.next_exp = int(self.next_exp * 1.2) + 50
+            return True # レベルアップした
+        return False
+
+    def learn(self, key: str):
+        """スキルkeyのレベルを1上げ、発射パターンを計算し直す"""
+        self.skill[key] += 1
+        self.update_pattern()
+
+    def update_pattern(self):
+        """現在のスキルレベルでの発射パターンを用意する（スキルを直接変えたときに呼ぶ）"""
+        self.pattern = patterns.compile(self.pattern_name, self.skill)
+
+    def set_img(self, num: int):
+        self.image = sprites.variant(f"fig/{num}.png", ("zoom", 0, 0.9))
+
+    def change_img(self, num: int, screen: pg.Surface):
+        self.set_img(num)
+        screen.blit(self.image, self.rect)
+
+    def update(self, key_lst: list[bool], targets: TargetGroup):
+        # 移動処理
+        sum_mv = [0, 0]
+        for k, mv in self.rules.delta.items():
+            if key_lst[k]:
+                sum_mv[0] += mv[0]
+                sum_mv[1] += mv[1]
+        
+        self.rect.move_ip(self.speed*sum_mv[0], self.speed*sum_mv[1])
+        if check_bound(self.rect) != (True, True):
+            self.rect.move_ip(-self.speed*sum_mv[0], -self.speed*sum_mv[1])
+            
+        if not (sum_mv[0] == 0 and sum_mv[1] == 0):
+            self.dire = tuple(sum_mv)
+            self.image = self.imgs[self.dire]
+
+        # --- オートエイム & 攻撃準備 ---
+        nearest = get_nearest_target(self, targets)
+        if nearest:
+            # 敵がいればそちらを向くベクトルを計算
+            self.aim_vec = calc_orientation(self.rect, nearest.rect)
+        elif not (sum_mv[0] == 0 and sum_mv[1] == 0):
+            # 敵がいなくて移動していれば、移動方向を向く
+            norm = math.sqrt(sum_mv[0]**2 + sum_mv[1]**2)
+            self.aim_vec = (sum_mv[0]/norm, sum_mv[1]/norm)
+
+        self.timer += 1
+
+    def hp_bar(self):
+        """頭上のHPバーを(画像, 位置)で返す（Game.snapshot()が敵の分や他の画像とまとめて1回のblitsで描く）"""
+        # バーの位置とサイズ
+        bar_w = self.rect.width        # 幅はキャラと同じ
+        bar_h = 5                      # 高さは5px
+        bar_x = self.rect.left
+        bar_y = self.rect.top - 10     # キャラクターの10px上
+        
+        # HPの割合計算
+        ratio = self.hp / self.max_hp
+        if ratio < 0: ratio = 0
+        
+        # HP残量（緑色：敵の赤と区別しやすくするため）
+        # HPが少なくなったら色を変えるなどの演出もここで可能です
+        color = (0, 255, 0)
+        if ratio < 0.3:
+            color = (255, 0, 0) # ピンチのときは赤
+        elif ratio < 0.6:
+            color = (255, 255, 0) # 半分以下は黄色
+
+        # 背景は暗いグレー
+        return hpbars.bar(bar_x, bar_y, bar_w, bar_h, ratio, color, (50, 50, 50))
+
+    def ready(self) -> bool:
+        """次の発射の間隔が経っているか"""
+        return self.timer >= max(5, self.attack_interval - self.skill["speed"] * 2)
+
+    def shoot(self, beams_group):
+        """現在のスキル状況に応じてビームを発射する"""
+        if not self.ready():
+            return
+
+        self.timer = 0
+        
+        # 事前計算したパターン（弾数・拡散角度・性能）を照準の向きに回して発射する
+        for shot, angle, vx, vy in self.pattern.volley(self.aim_vec):
+            self.fire(beams_group, shot, angle, vx, vy)
+
+    def fire(self, beams_group, shot: Shot, angle: float, vx: float, vy: float):
+        """ビームを1発発射する（numpy版のビーム管理にも対応）"""
+        if isinstance(beams_group, BeamArray):
+            beams_group.spawn(self, shot, angle, vx, vy)
+        else:
+            beams_group.add(Beam.spawn(self, shot, angle, vx, vy))
+
+
+class Beam(PooledSprite):
+    """スキル強化対応ビームクラス"""
+    def reset(self, bird: Bird, shot: Shot, angle: float, vx: float, vy: float):
+        self.angle = angle
+        self.vx = vx
+        self.vy = vy
+        
+        self.image = sprites.rotated(BEAM_IMG, self.angle)
+        self.rect = self.image.get_rect()
+        self.reflect_img = bird.rules.beam_reflect_img
+        
+        # 発射位置を中心に設定
+        self.rect.centerx = bird.rect.centerx + bird.rect.width * self.vx * 0.5
+        self.rect.centery = bird.rect.centery + bird.rect.height * self.vy * 0.5
+        
+        # スキル値の反映（発射パターンに計算済み）
+        self.speed = shot.speed
+        self.damage = shot.damage
+        self.reflect_count = shot.reflect
+        self.pierce_count = shot.pierce
+        
+        # 多段ヒット防止用セット
+        self.hit_enemies = set()
+
+    def update(self):
+        self.rect.move_ip(self.speed * self.vx, self.speed * self.vy)
+        
+        # 画面端での判定（反射 or 消滅）
+        yoko, tate = check_bound(self.rect)
+        if not yoko:
+            if self.reflect_count > 0:
+                self.vx *= -1
+                self.reflect_count -= 1
+                # 画像の回転は複雑になるので今回は省略するか、簡易的に反転
+                self.angle = 180 - self.angle
+                self.image = sprites.rotated(BEAM_IMG, self.angle)
+            else:
+                self.kill()
+        
+        if not tate:
+            if self.reflect_count > 0:
+                self.vy *= -1
+                self.reflect_count -= 1
+                self.angle = -self.angle
+                self.image = sprites.rotated(self.reflect_img, self.angle)
+            else:
+                self.kill()
+
+class DamageText(PooledSprite):
+    """
+    ダメージ値を画面上にポップアップ表示するクラス
+    """
+    def reset(self, damage: int, center: tuple[int, int], color=(255, 0, 0)):
+        self.image = texts.render(str(damage), 40, color)
+        self.rect = self.image.get_rect(center=center)
+        self.life, self.vy = 30, -2 # 30フレーム表示し、上に移動する
+    def update(self):
+        self.rect.y += self.vy; self.life -= 1
+        if self.life < 0: self.kill()
+        
+class Enemy(pg.sprite.Sprite):
+    """敵機クラス（HP制）"""
+    imgs = [f"fig/alien{i}.png" for i in range(1, 4)]  # 読み込みはspritesで行う
+    
+    def __init__(self, level):
+        super().__init__()
+        self.image = sprites.variant(random.choice(__class__.imgs), ("zoom", 0, 0.8))  # 0.8倍の画像を共有する
+        self.rect = self.image.get_rect()
+        self.rect.center = random.randint(0, WIDTH), 0
+        self.vx, self.vy = 0, +random.randint(3, 6)
+        self.bound = random.randint(50, HEIGHT//2)
+        self.state = "down"
+        self.interval = random.randint(50, 300)
+
+        self.max_hp = level
+        self.hp = self.max_hp
+
+    def update(self):
+        if self.rect.centery > self.bound:
+            self.vy = 0
+            self.state = "stop"
+        self.rect.move_ip(self.vx, self.vy)
+
+    def hp_bar(self):
+        """簡易HPバーを(画像, 位置)で返す（HPが減っていなければNone）"""
+        if self.hp < self.max_hp:
+            return hpbars.bar(self.rect.left, self.rect.top-5, self.rect.width, 4, self.hp / self.max_hp, (255,0,0))
+        return None
+
+
+class Bomb(PooledSprite):
+    """爆弾クラス"""
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
+
+    @staticmethod
+    def make_img(rad: int, color: tuple[int, int, int]) -> pg.Surface:
+        img = pg.Surface((2*rad, 2*rad))
+        pg.draw.circle(img, color, (rad, rad), rad)
+        img.set_colorkey((0, 0, 0))
+        return img
+
+    def reset(self, emy: Enemy, bird: Bird):
+        rad = random.randint(10, 50)
+        color = random.choice(__class__.colors)
+        # 同じ大きさ・色の爆弾は画像を共有する
+        self.image = sprites.generate(("bomb", rad, color), lambda: __class__.make_img(rad, color))
+        self.rect = self.image.get_rect()
+        self.vx, self.vy = calc_orientation(emy.rect, bird.rect)
+        self.rect.centerx = emy.rect.centerx
+        self.rect.centery = emy.rect.centery + emy.rect.height//2
+        self.speed = 6
+        self.hp = 1 # 爆弾は1発で壊れる
+
+    def update(self):
+        """爆弾を移動させる処理"""
+        self.rect.move_ip(self.speed * self.vx, self.speed * self.vy)
+        if check_bound(self.rect) != (True, True):
+            self.kill()
+
+class Explosion(PooledSprite):
+    """爆発クラス"""
+    def reset(self, obj, life: int):
+        path = "fig/explosion.gif"
+        self.imgs = [sprites.load(path), sprites.variant(path, ("flip", True, True))]
+        self.image = self.imgs[0]
+        self.rect = self.image.get_rect(center=obj.rect.center)
+        self.life = life
+
+    def update(self):
+        self.life -= 1
+        self.image = self.imgs[self.life//10%2]
+        if self.life < 0:
+            self.kill()
+
+
+class Score:
+    def __init__(self):
+        self.color = (0, 0, 255)
+        self.value = 0
+        self.image = texts.render(f"Score: {self.value}", 50, self.color, antialias=False)
+        self.rect = self.image.get_rect()
+        self.rect.center = 100, HEIGHT-50
+
+    def update(self, screen: pg.Surface) -> pg.Rect:
+        return self.draw(screen, self.value)
+
+    def draw(self, screen: pg.Surface, value: int) -> pg.Rect:
+        """スコアvalueを表示する（スナップショットからの描画用）"""
+        self.image = texts.render(f"Score: {value}", 50, self.color, antialias=False)
+        return screen.blit(self.image, self.rect)
+
+
+class Hud(NamedTuple):
+    """スナップショットに入れるHUDの値（draw_exp_barにこうかとんの代わりに渡せる）"""
+    score: int
+    level: int
+    exp: int
+    next_exp: int
+
+
+class Heal(pg.sprite.Sprite):
+    """
+    回復アイテムに関するクラス
+    """
+    @staticmethod
+    def make_img() -> pg.Surface:
+        img = pg.Surface((30, 30))
+        img.fill((0, 255, 0))  # 緑色
+        return img
+
+    def __init__(self):
+        super().__init__()
+        self.image = sprites.generate(("heal",), __class__.make_img)
+        self.rect = self.image.get_rect() 
+        self.rect.center = random.randint(0, WIDTH), 0 
+        self.vy = 4
+
+    def update(self):
+        self.rect.move_ip(0, self.vy)
+        if self.rect.top > HEIGHT:
+            self.kill()
+
+# オブジェクトプール（kill()されたスプライトを再利用する）
+Beam.pool = SpritePool(Beam, POOL_SIZES["beam"])
+Bomb.pool = SpritePool(Bomb, POOL_SIZES["bomb"])
+Explosion.pool = SpritePool(Explosion, POOL_SIZES["explosion"])
+DamageText.pool = SpritePool(DamageText, POOL_SIZES["damage_text"])
+
+# =====================
+# メインループ
+# =====================
+class Sound(Mixer):
+    """
+    サウンド管理クラス
+    他の機能を搭載したときに音声を流す
+    読み込みはassetsで並行して行い、読み込みが終わっていない音は鳴らさない
+    効果音は種類ごとに同時に鳴る数を制限し、同じフレームに何度鳴らしても1回にまとめる
+    """
+    voices = {"enemy_kill": 3, "damage": 2, "death": 1, "level_up": 1, "recovery": 1}  # 同時に鳴らせる数
+
+    def __init__(self):
+        self.effects = {
+            "enemy_kill": assets.sound("sound/explosion.mp3"),  # 敵を倒したときの音
+            "damage": assets.sound("sound/damage.mp3"),  # 被ダメ時の音声
+            "death": assets.sound("sound/himei.mp3"),  # 自分が倒された時の音声
+            "level_up": assets.sound("sound/level_up.mp3"),  # レベルが上がった時の音
+            "recovery": assets.sound("sound/recovery.mp3"),  # 回復した時の音  
+        }
+        super().__init__(__class__.voices)
+
+        self.bgm = assets.music("sound/bgm.mp3")  # bgm
+        self.bgm_on = False  # BGMを流す状態か
+        self.bgm_playing = False
+
+    def sound(self, name: str) -> pg.mixer.Sound | None:
+        return loaded(self.effects[name])
+
+    def update(self):
+        """このフレームに鳴らす効果音を鳴らし、BGMの読み込みが終わっていれば流し始める（毎フレーム呼ぶ）"""
+        self.flush()
+        if self.bgm_on and not self.bgm_playing and self.bgm.done() and self.bgm.exception() is None:
+            pg.mixer.music.play(loops=-1)
+            self.bgm_playing = True
+
+    def reduce_voices(self, reduced: bool):
+        """効果音の同時に鳴らせる数を1に減らす（Falseで元に戻す）"""
+        for name, voices in __class__.voices.items():
+            self.limit(name, 1 if reduced else voices)
+
+    def play_bgm(self):
+        self.bgm_on = True
+        self.update()
+
+    def stop_bgm(self):  # 自分が倒されたときにbgmをとめる
+        self.bgm_on = False
+        if self.bgm_playing:
+            pg.mixer.music.stop()
+            self.bgm_playing = False
+
+    def play_enemy_kill(self):
+        self.play("enemy_kill")
+
+    def play_damage(self):
+        self.play("damage")
+
+    def play_death(self):
+        self.play("death")
+
+    def play_level_up(self):
+        self.play("level_up")
+
+    def play_recovery(self):
+        self.play("recovery")
+
+
+class Game:
+    """
+    ゲームの状態（こうかとん・スプライトグループ・スコア・タイマー）をまとめて持つクラス
+    step()で1ステップ（1/50秒）ぶんゲームを進める
+    描画はsnapshot()で描く内容を写し取り、render()で描くという2段階で行う（更新と描画を別スレッドにできる）
+    """
+    def __init__(self, rules: Rules, sounds: Sound, projectiles: str = "sprite", caps: dict | None = None,
+                 tracer=None, pixel_collide: bool = False, quality: QualityGovernor | None = None):
+        self.sounds = sounds
+        self.move_keys = () if rules.fire_while_moving else tuple(rules.delta)  # 押している間は撃たないキー
+        self.quality = quality or QualityGovernor()  # 重いときに省く演出の段階（main()が処理時間を渡す）
+        self.masks = masks if pixel_collide else None  # 矩形が重なった組だけピクセル単位でも判定する
+        self.collided = masks.collide if pixel_collide else None
+        self.budget = EntityBudget(caps)  # グループごとの出現数の上限
+        self.tracer = tracer or NullTracer()  # 処理時間のトレース出力
+        self.timer = FrameTimer(tracer=tracer)  # 処理段階ごとの時間計測（オーバーレイ表示中・トレース中のみ）
+        self.score = Score()
+        self.bird = Bird(3, (225, 400), rules)
+        self.bombs = GridGroup()  # 当たり判定用に空間ハッシュで管理
+        if projectiles == "numpy":
+            # ビームをnumpy配列でまとめて管理する（大量のビーム向け）
+            self.beams = BeamArray(BEAM_IMG, sprites, WIDTH, HEIGHT, reflect_path=rules.beam_reflect_img)
+        else:
+            self.beams = pg.sprite.Group()
+        self.exps = pg.sprite.Group()
+        self.emys = GridGroup()
+        self.heals = pg.sprite.Group()
+        self.targets = TargetGroup()  # オートエイムのターゲット候補（敵と爆弾）
+        self.tmr = 0  # 経過ステップ数
+
+        # ゲーム状態管理: PLAY, SELECT, GAMEOVER
+        self.state = "PLAY"
+        self.skill_choices = []
+        self.prev_pos = {}  # ステップ開始時の各スプライトの位置（描画の補間用）
+
+    def named_groups(self) -> dict[str, pg.sprite.AbstractGroup]:
+        """グループ名とグループの対応"""
+        return {"beams": self.beams, "emys": self.emys, "bombs": self.bombs,
+                "exps": self.exps, "heals": self.heals}
+
+    def add_effect(self, cls, *args, **kwargs):
+        """爆発・数値表示を追加する（上限に達しているときや、重くて演出を省いているときは追加しない）"""
+        quality = self.quality
+        if cls is DamageText and quality.shed("damage_text"):
+            return
+        if cls is Explosion:
+            if quality.shed("explosions"):
+                return
+            if quality.shed("short_explosions"):
+                obj, life = args
+                args = obj, life // 2
+        if self.budget.allow("exps", self.exps):
+            self.exps.add(cls.spawn(*args, **kwargs))
+
+    def sprite_groups(self) -> list[pg.sprite.AbstractGroup]:
+        """スプライトで管理しているグループ（numpy版のビームは除く）"""
+        groups = [self.emys, self.bombs, self.exps, self.heals]
+        if not isinstance(self.beams, BeamArray):
+            groups.insert(0, self.beams)
+        return groups
+
+    def blit_items(self, group: pg.sprite.AbstractGroup) -> list[tuple]:
+        """グループを描くための(画像, 位置[, 切り出す矩形])のリスト（アトラスがあればアトラスから描く）"""
+        if isinstance(group, BeamArray):
+            return group.blit_items()
+        if sprites.atlas is not None:
+            return sprites.atlas.blit_items(group)
+        return [(spr.image, spr.rect.topleft) for spr in group]
+
+    def collide_beams(self, group: GridGroup) -> dict:
+        """groupとビームの当たり判定（{groupのスプライト: [当たったビーム, ...]}）"""
+        if isinstance(self.beams, BeamArray):
+            return self.beams.groupcollide(group, self.masks)
+        return groupcollide(group, self.beams, False, False, self.collided)
+
+    def select_skill(self, key: str):
+        """スキル選択画面で選ばれたスキルを反映し、ゲームを再開する"""
+        self.bird.learn(key)
+        self.state = "PLAY"
+
+    def step(self, key_lst):
+        """1ステップぶんゲームを進める（出現・発射・当たり判定・移動）"""
+        bird, sounds, score, tmr = self.bird, self.sounds, self.score, self.tmr
+        beams, emys, bombs, exps, heals = self.beams, self.emys, self.bombs, self.exps, self.heals
+
+        self.prev_pos = {s: s.rect.topleft for g in self.sprite_groups() for s in g}
+        self.prev_pos[bird] = bird.rect.topleft
+
+        # 敵の出現
+        if tmr % 10 == 0:
+            # 時間経過で敵が少し強くなる
+            difficulty = 1 + (tmr // 500)
+            if self.budget.allow("emys", emys):
+                emy = Enemy(level=difficulty)
+                emys.add(emy)
+                self.targets.add(emy)
+            else:
+                # 上限に達したら新しく出さず、今いる敵を強化する
+                self.budget.merge(emys, difficulty)
+
+        # 回復アイテムの出現
+        if tmr % 500 == 0 and self.budget.allow("heals", heals): 
+            heals.add(Heal())
+            
+        # 爆弾投下
+        for emy in emys:
+            if emy.state == "stop" and tmr % emy.interval == 0 and self.budget.allow("bombs", bombs):
+                bomb = Bomb.spawn(emy, bird)
+                bombs.add(bomb)
+                self.targets.add(bomb)
+        
+        # ビーム発射（オート）
+        if not any(key_lst[k] for k in self.move_keys):
+            # 発射の間隔が経ったときだけ上限を確かめる（上限に達していたらその斉射は撃たずに次の間隔を待つ）
+            if bird.ready():
+                if self.budget.allow("beams", beams):
+                    with self.tracer.span("Bird.shoot"):
+                        bird.shoot(beams)
+                else:
+                    bird.timer = 0
+        self.timer.mark("spawn")
+
+        # --- 当たり判定処理 ---
+        # 前ステップから移動した敵・爆弾だけグリッドを更新する
+        emys.rebin()
+        bombs.rebin()
+        
+        # ビーム vs 敵 (貫通処理対応)
+        # groupcollideは使わず、貫通制御のためループで処理
+        with self.tracer.span("collide.beams_emys"):
+            hits = self.collide_beams(emys)
+        for emy, hit_beams in hits.items():
+            for beam in hit_beams:
+                if emy not in beam.hit_enemies:
+                    emy.hp -= beam.damage
+                    beam.hit_enemies.add(emy)
+                    
+                    # 貫通力消費
+                    if beam.pierce_count > 0:
+                        beam.pierce_count -= 1
+                    else:
+                        beam.kill()
+                        
+                    if emy.hp <= 0:
+                        sounds.play_enemy_kill()
+                        self.add_effect(Explosion, emy, 100)
+                        score.value += 10
+                        emy.kill()
+                        # 経験値ゲット & レベルアップ判定
+                        if bird.gain_exp(30):
+                            sounds.play_level_up()
+                            self.state = "SELECT"
+                            # ランダムに3つのスキルを提示
+                            all_skills = list(bird.skill.keys())
+                            self.skill_choices = random.sample(all_skills, 3)
+                        break # 同フレームで多重ヒット防止
+
+        # ビーム vs 爆弾
+        with self.tracer.span("collide.beams_bombs"):
+            bomb_hits = self.collide_beams(bombs)
+        for bomb in bomb_hits.keys():
+            # 爆弾は貫通関係なく当たれば爆発
+            self.add_effect(Explosion, bomb, 50)
+            score.value += 1
+            bomb.kill()
+            if bird.gain_exp(10):
+                self.state = "SELECT"
+                self.skill_choices = random.sample(list(bird.skill.keys()), 3)
+
+        # プレイヤー被弾判定
+        with self.tracer.span("collide.bird_bombs"):
+            bird_hits = spritecollide(bird, bombs, True, self.collided)
+        for bomb in bird_hits:
+            sounds.play_damage()
+            bird.hp -= 20        # ダメージ量
+            self.add_effect(Explosion, bomb, 50)
+
+        if bird.hp <= 0:
+            self.state = "GAMEOVER"
+            return
+        
+        for heal in pg.sprite.spritecollide(bird, heals, True):
+            sounds.play_recovery()
+            heal_amount = int(bird.max_hp * 0.3)   # 最大HPの30%
+            bird.hp = min(bird.max_hp, bird.hp + heal_amount)
+            self.add_effect(DamageText, heal_amount, bird.rect.center, color=(0, 255, 0))
+        self.timer.mark("collide")
+
+        # 更新
+        self.targets.rebin()
+        bird.update(key_lst, self.targets)
+        with self.tracer.span("Beam.update"):
+            beams.update()
+        emys.update()
+        bombs.update()
+        exps.update()
+        heals.update()
+        self.timer.mark("update")
+
+        self.tmr += 1
+
+    def snapshot(self) -> Snapshot:
+        """現在の描画内容（背景とスキル選択のオーバーレイは除く）を写し取る"""
+        bird = self.bird
+        if self.state == "SELECT":
+            # プレイ画面は止まったまま描画だけ残す
+            bird.set_img(6) # レベルアップ時は喜ぶ
+        items = [(bird.image, bird.rect.topleft)]
+        items += self.blit_items(self.beams)
+        items += self.blit_items(self.emys)
+        if self.state != "SELECT":
+            # HPバー（こうかとんと敵の分をまとめて1回で描く、HPが減っていない敵と重いときの敵の分は省く）
+            items.append(bird.hp_bar())
+            if not self.quality.shed("hp_bars"):
+                items += [emy.hp_bar() for emy in self.emys if emy.hp < emy.max_hp]
+        items += self.blit_items(self.bombs)
+        items += self.blit_items(self.exps)
+        if self.state != "SELECT":
+            items += self.blit_items(self.heals)
+        hud = Hud(self.score.value, bird.level, bird.exp, bird.next_exp)
+        counts = tuple((name, len(group)) for name, group in self.named_groups().items())
+        return Snapshot(self.state, tuple(items), hud, counts)
+
+    def render(self, screen: pg.Surface, snap: Snapshot) -> list[pg.Rect]:
+        """
+        スナップショットを描画する
+        描画した矩形のリストを返す（差分更新用、スキル選択中は画面全体を描き直すので空）
+        """
+        rects = screen.blits(snap.blits)
+        rects.append(self.score.draw(screen, snap.hud.score))
+        
+        # UI描画
+        rects.append(draw_exp_bar(screen, snap.hud))
+        return [] if snap.state == "SELECT" else rects
+
+
+def main(rules: Rules, headless: bool = False, frames: int | None = None, seed: int | None = None, inputs=None,
+         fps: int = FPS, max_steps: int = MAX_STEPS, interpolate: bool = False, render: str = "dirty",
+         projectiles: str = "sprite", caps: dict | None = None, overlay: bool = False, tracer=None,
+         recorder: Recorder | None = None, atlas: bool = False, pipeline: bool = False, pixel_collide: bool = False,
+         governor: bool = True, frame_budget: float = 1 / FPS):
+    """
+    ゲームのメインループ
+    ゲームは固定長のステップ単位で進み、描画が遅れたときは1回の描画で複数ステップ進めて追いつく
+    rules: 操作キー・移動中の発射などのゲームごとの決まり
+    headless: Trueのときフレームレートを制限せず、入力をinputsから受け取る（1フレーム1ステップ）
+    frames: 指定したフレーム数を実行したら終了する
+    seed: 乱数のシード（敵・爆弾・回復アイテム・スキル候補がすべて再現される）
+    inputs: NullInput/ScriptedInput/ReplayInputなど（Noneならキーボード・マウス）
+    fps: 描画の上限フレームレート（0で無制限）
+    max_steps: 1回の描画あたりに進める最大ステップ数
+    interpolate: 直前のステップとの間を補間して描画する
+    render: "dirty"なら変化した部分だけ、"full"なら毎フレーム画面全体を描き直す
+    projectiles: "numpy"ならビームをnumpy配列でまとめて管理する（"sprite"は従来のスプライト）
+    caps: グループごとの出現数の上限（{"emys": 80}など、省略したグループは無制限、既定ではどのグループも無制限）
+    overlay: パフォーマンス表示を最初から表示する（F3キーで切り替え）
+    tracer: 処理段階と主な処理の時間を記録するTracer（閉じるのは呼び出し側）
+    recorder: ステップごとのキー状態とスキル選択を記録するRecorder（保存は呼び出し側）
+    atlas: 小さな画像をテクスチャアトラスに詰めて、グループごとにまとめて描く（比較用、既定ではpygameのGroupと同じく1枚ずつblitsで描く）
+    pixel_collide: ビーム・爆弾の当たり判定を矩形が重なった組だけピクセル単位でも行う
+    pipeline: ゲームの更新を別スレッドで行い、前フレームの状態を描く間に次のステップを進める（1フレーム遅れて表示される）
+    governor: 1フレームの処理時間がframe_budget[秒]を超え続けたら、演出（爆発・数値表示・敵のHPバー・効果音）を段階的に省く
+    """
+    launch = time.perf_counter()
+    if seed is not None:
+        random.seed(seed)
+    if headless and inputs is None:
+        inputs = NullInput()
+    pg.display.set_caption("真！こうかとん無双 - Survivor Mode")
+    screen = pg.display.set_mode((WIDTH, HEIGHT))
+
+    # 画像・音声を並行して読み込み、画像が揃うまで読み込み画面を出す（BGMは揃い次第流す）
+    reused = bool(assets.images)  # 同じプロセスで読み込み済みのアセットを使い回すか
+    for path in [BG_IMG, BEAM_IMG, rules.beam_reflect_img, "fig/3.png", "fig/8.png", "fig/explosion.gif", *Enemy.imgs]:
+        assets.image(path)
+    assets.after_images("Bird.load_imgs", Bird.load_imgs, 3)
+    sounds = Sound()
+    # スキル選択画面で使う日本語フォントを先に読み込んでおく
+    get_jp_font(30)
+    get_jp_font(60)
+    clock = pg.time.Clock() 
+    closed = False  # 読み込み中にウィンドウを閉じた（読み込みが終わったら結果を返して終わる）
+    while not assets.ready():
+        if not headless and not closed:
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    closed = True
+            draw_loading(screen, *assets.progress())
+            pg.display.update()
+        clock.tick(60)
+    # 読み込んだ画像を画面の形式に変換しておく（描画のたびに変換しない）
+    sprites.convert()
+    if atlas and sprites.atlas is None:
+        sprites.use_atlas(Atlas())
+    elif not atlas:
+        sprites.use_atlas(None)
+    ready_s = round(time.perf_counter() - launch, 3)
+
+    def startup() -> dict:
+        """
+        起動の種類と時間（効果音は起動後も読み込むので、結果をまとめるときに数える）
+        warm: 読み込み済みのアセットを使い回したか、ディスクのキャッシュ（PCM・フォント検索）がすべて使えた起動
+        """
+        disk = [*assets.pcm_hits.values(), *texts.sysfont_hits.values()]
+        warm = reused or (bool(disk) and all(disk))
+        return {"mode": "warm" if warm else "cold", "memory": reused, "disk": f"{sum(disk)}/{len(disk)}",
+                "ready_s": ready_s}
+
+    bg_img = sprites.load(BG_IMG)
+    renderer = Renderer(screen, bg_img, render)
+
+    quality = QualityGovernor(frame_budget) if governor else None
+    game = Game(rules, sounds, projectiles, caps, tracer, pixel_collide, quality)
+    bird, score = game.bird, game.score
+    timer = game.timer
+    perf_overlay = PerfOverlay(timer)
+    if pipeline:
+        # 更新スレッドの中の計測はメインスレッドのフレームと別にする（トレースには記録する）
+        game.timer = FrameTimer(tracer=tracer)
+    if overlay:
+        perf_overlay.toggle()
+    timestep = FixedTimestep(max_steps=max_steps)
+    dt = timestep.step
+    choice_rects = []
+
+    def simulate(steps: int, keys, alpha: float | None) -> Snapshot:
+        """
+        stepsステップ進めて、描画内容のスナップショットを返す（pipelineのときは更新スレッドで実行）
+        keys: キー状態（Noneならinputsから受け取る）
+        alpha: 補間の割合（Noneなら補間しない）
+        """
+        if pipeline:
+            game.timer.begin()  # 更新スレッドの計測は頼まれた更新ごとに測る
+        for _ in range(steps):
+            key_lst = keys if inputs is None else inputs.keys(game.tmr)
+            if recorder is not None:
+                recorder.record_keys(game.tmr, key_lst)
+            game.step(key_lst)
+            if game.state != "PLAY":
+                break
+        if game.state == "PLAY" and alpha is not None:
+            with interpolated(game.prev_pos, alpha):
+                return game.snapshot()
+        return game.snapshot()
+
+    sim = SimThread(simulate, game.snapshot()) if pipeline else None
+    snap = None
+
+    frame = 0
+    start = time.perf_counter()
+
+    def result(gameover: bool) -> dict:
+        """実行結果（フレーム数・FPS・エンティティ数など）をまとめる"""
+        if sim is not None:
+            sim.close()
+        elapsed = time.perf_counter() - start
+        return {
+            "frames": frame, "elapsed": elapsed, "fps": frame / elapsed if elapsed else 0.0,
+            "steps": game.tmr, "score": score.value, "level": bird.level, "hp": bird.hp, "gameover": gameover,
+            "entities": {name: len(group) for name, group in game.named_groups().items()},
+            "budget": game.budget.report(game.named_groups()),
+            "pools": {cls.__name__: cls.pool.stats() for cls in (Beam, Bomb, Explosion, DamageText)},
+            "audio": sounds.stats(),
+            "caches": {"text": texts.stats(), "sprite": sprites.stats(), "hpbar": hpbars.stats(),
+                       "pattern": patterns.stats(),
+                       **({"atlas": sprites.atlas.stats()} if sprites.atlas is not None else {}),
+                       **({"mask": masks.stats()} if pixel_collide else {})},
+            "startup": {**startup(), "assets": assets.stats()},
+            **({"pipeline": sim.stats()} if sim is not None else {}),
+            **({"quality": quality.stats()} if quality is not None else {}),
+        }
+
+    def game_over() -> dict:
+        sounds.stop_bgm()
+        screen.blit(bg_img, [0, 0])
+        bird.change_img(8, screen)
+        score.update(screen)
+        pg.display.update()
+        sounds.play_death()
+        sounds.update()
+        if not headless:
+            time.sleep(2)
+        return result(True)
+
+    def select_skill(key: str):
+        if recorder is not None:
+            recorder.record_choice(game.tmr, key)
+        game.select_skill(key)
+
+    if closed:
+        return result(False)
+    sounds.play_bgm()
+
+    while True:
+        timer.begin()
+        frame_start = time.perf_counter()
+        if sim is not None:
+            # 前フレームに頼んだ更新が終わるのを待つ（ここから先は更新スレッドが止まっている）
+            snap = sim.wait()
+            sounds.update()  # 更新中に鳴らす予定になった効果音をまとめて鳴らす
+            timer.mark("update")
+            if game.state == "GAMEOVER":
+                return game_over()
+
+        if frames is not None and frame >= frames:
+            return result(False)
+        if inputs is not None and inputs.finished(game.tmr):
+            return result(False)
+
+        # イベント処理
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                return result(False)
+
+            # パフォーマンス表示の切り替え
+            if event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                perf_overlay.toggle()
+            
+            # スキル選択時のクリック処理
+            if game.state == "SELECT" and event.type == pg.MOUSEBUTTONDOWN and inputs is None:
+                m_pos = pg.mouse.get_pos()
+                for rect, key in choice_rects:
+                    if rect.collidepoint(m_pos):
+                        select_skill(key)
+                        timestep.reset()
+                        break
+
+        # ヘッドレス時・再生時のスキル選択
+        if game.state == "SELECT" and inputs is not None:
+            select_skill(inputs.choose(game.skill_choices))
+
+        timer.mark("events")
+        selecting = game.state == "SELECT"
+
+        # === ゲームプレイ中 ===
+        if game.state == "PLAY":
+            # 経過時間ぶんのステップを進める（描画が遅れたら複数ステップまとめて進める）
+            steps = 1 if headless else timestep.advance(dt)
+            keys = pg.key.get_pressed() if inputs is None else None
+            alpha = timestep.alpha if interpolate else None
+            if sim is not None:
+                # 更新スレッドに次のステップを頼み、その間に前フレームのスナップショットを描く
+                sim.submit(steps, keys, alpha)
+            else:
+                snap = simulate(steps, keys, alpha)
+        elif sim is None:
+            snap = game.snapshot()
+
+        if sim is None:
+            sounds.update()  # このフレームに鳴らす効果音をまとめて鳴らす
+            if game.state == "GAMEOVER":
+                return game_over()
+
+        # 背景描画（前フレームに描いた部分を消す）
+        renderer.clear()
+        rects = game.render(screen, snap)
+        if snap.state != "PLAY":
+            # スキル選択に入ったフレームは描いた矩形を返さないので、前後のフレームは画面全体を描き直す
+            renderer.invalidate()
+
+        # === スキル選択画面 ===
+        if selecting:
+            # 選択画面オーバーレイ
+            with game.tracer.span("draw_skill_select"):
+                choice_rects = draw_skill_select(screen, game.skill_choices)
+            renderer.invalidate()
+
+        counts = dict(snap.counts)
+        overlay_rect = perf_overlay.draw(screen, counts, {"quality": game.quality.describe()} if quality else None)
+        if overlay_rect is not None:
+            rects.append(overlay_rect)
+        timer.mark("draw")
+
+        renderer.present(rects)
+        timer.mark("flip")
+        if quality is not None and quality.frame(time.perf_counter() - frame_start):
+            # 品質の段階が変わった（効果音の数はここで、他の演出は出すとき・描くときに反映する）
+            sounds.reduce_voices(quality.shed("voices"))
+        dt = timestep.step if headless else clock.tick(fps) / 1000
+        timer.mark("wait")
+        timer.end()
+        frame += 1
+
+
+def cli(rules: Rules):
+    """コマンドライン引数を解釈してゲームを実行する（Legend_kokaton.py・musou_kokaton.pyの起動処理）"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true", help="ウィンドウなし・フレームレート無制限で実行する")
+    parser.add_argument("--frames", type=int, default=None, help="指定フレーム数で終了する（ヘッドレス時の既定値は3000）")
+    parser.add_argument("--seed", type=int, default=None, help="乱数のシード")
+    parser.add_argument("--fps", type=int, default=FPS, help="描画の上限フレームレート（0で無制限）")
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS, help="1回の描画で追いつくために進める最大ステップ数")
+    parser.add_argument("--interpolate", action="store_true", help="ステップ間の位置を補間して描画する")
+    parser.add_argument("--render", choices=RENDER_MODES, default="dirty", help="描画方式（dirty: 差分更新, full: 全体描き直し）")
+    parser.add_argument("--projectiles", choices=("sprite", "numpy"), default="sprite", help="ビームの管理方式")
+    parser.add_argument("--pixel-collide", action="store_true", help="ビーム・爆弾の当たり判定をピクセル単位で行う")
+    parser.add_argument("--no-governor", action="store_true", help="重いときに演出を省く自動調整をしない")
+    parser.add_argument("--frame-budget", type=float, default=1000 / FPS, metavar="MS",
+                        help="演出を省き始める1フレームの処理時間[ms]（既定20）")
+    parser.add_argument("--pipeline", action="store_true", help="ゲームの更新を別スレッドで行い、描画と並行させる")
+    parser.add_argument("--atlas", action="store_true", help="小さな画像をテクスチャアトラスに詰めて描く（比較用）")
+    parser.add_argument("--overlay", action="store_true", help="パフォーマンス表示を最初から表示する（F3キーで切り替え）")
+    parser.add_argument("--trace", metavar="PATH", help="処理時間のトレースをファイルに書き出す")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default="chrome",
+                        help="トレースの形式（chrome: Chromeトレース形式のJSON, jsonl: 1行1イベント）")
+    parser.add_argument("--record", metavar="PATH", help="シード・キー入力・スキル選択をファイルに記録する")
+    parser.add_argument("--replay", metavar="PATH", help="記録したファイルの入力を再生する（--headlessと併用すると描画なしで実行）")
+    parser.add_argument("--cap", action="append", default=[], metavar="GROUP=N",
+                        help="グループの出現数の上限（例: emys=80、noneで無制限、defaultで推奨値、複数指定可）")
+    args = parser.parse_args()
+    try:
+        caps = parse_caps(args.cap)
+    except ValueError as e:
+        parser.error(str(e))
+    seed, inputs, recorder = args.seed, None, None
+    if args.replay:
+        try:
+            inputs = ReplayInput(args.replay)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        seed = inputs.seed
+    elif args.record:
+        # シードが指定されていなければ決めておき、再生できるように記録する
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        try:
+            recorder = Recorder(seed)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.headless:
+        setup_headless()
+        if args.frames is None and inputs is None:
+            args.frames = 3000
+    tracer = Tracer(args.trace, args.trace_format) if args.trace else None
+    pg.init()
+    try:
+        stats = main(rules, headless=args.headless, frames=args.frames, seed=seed, inputs=inputs,
+                     fps=args.fps, max_steps=args.max_steps, interpolate=args.interpolate, render=args.render,
+                     projectiles=args.projectiles, caps=caps, overlay=args.overlay, tracer=tracer,
+                     recorder=recorder, atlas=args.atlas, pipeline=args.pipeline,
+                     pixel_collide=args.pixel_collide, governor=not args.no_governor,
+                     frame_budget=args.frame_budget / 1000)
+    except ReplayDiverged as e:
+        pg.quit()
+        sys.exit(str(e))  # トレースバックではなく食い違ったステップだけを表示する
+    finally:
+        if tracer is not None:
+            tracer.close()
+    if recorder is not None:
+        recorder.save(args.record, stats["score"])
+    if args.headless:
+        report(stats)
+    else:
+        print(startup_line(stats["startup"]))
+    if inputs is not None:
+        print(f"replay: steps {inputs.played}/{inputs.steps}  score {stats['score']}/{inputs.score}"
+              + ("" if inputs.verify(stats["score"]) else "  (diverged)"))
+    pg.quit()
+    sys.exit()
@@ -0,0 +1,103 @@
+import math
+from typing import NamedTuple
+
+# =====================
+# 弾の発射パターン（スキルごとに事前計算）
+# =====================
+# スキルで変わる値は (基本値, スキル名, 1レベルあたりの増加量) で表す（スキル名がNoneなら基本値のまま）
+# ビーム1発の性能
+BEAM_STATS = {
+    "speed": (10, "speed", 1),
+    "damage": (1, "damage", 1),
+    "reflect": (0, "reflect", 1),
+    "pierce": (0, "pierce", 1),
+}
+# 発射パターン
+# shape: 弾の並べ方（SHAPESのキー）、count: 弾数、gap: 弾の間隔[度]
+# stats: このパターンの弾だけBEAM_STATSを上書きする値（属性弾など）
+PATTERNS = {
+    "fan": {"shape": "fan", "count": (1, "multi", 1), "gap": (10, "spread", 5)},
+}
+MAX_PATTERNS = 256  # 事前計算したパターンの保持上限
+
+
+def fan(count: int, gap: float) -> list[float]:
+    """照準を中心に、gap度おきに扇形に並べる（照準からの角度のリストを返す）"""
+    if count == 1:
+        return [0.0]
+    start = -gap * (count - 1) / 2
+    return [start + gap * i for i in range(count)]
+
+
+SHAPES = {"fan": fan}
+
+
+def level_value(spec: tuple, skill: dict[str, int]):
+    """(基本値, スキル名, 増加量) とスキルレベルから値を求める"""
+    base, name, per_level = spec
+    return base if name is None else base + skill.get(name, 0) * per_level
+
+
+class Shot(NamedTuple):
+    """パターンの中のビーム1発（照準からの角度とその単位ベクトル、性能）"""
+    offset: float  # 照準からの角度[度]
+    cos: float
+    sin: float
+    speed: int
+    damage: int
+    reflect: int
+    pierce: int
+
+
+class Pattern(NamedTuple):
+    """事前計算した発射パターン（照準の向きに回すだけで1回ぶんの弾になる）"""
+    name: str
+    shots: tuple[Shot, ...]
+
+    def volley(self, aim: tuple[float, float]) -> list[tuple[Shot, float, float, float]]:
+        """
+        照準の向きaim（画面座標、y軸は下向き）に回した弾の (Shot, 角度[度], vx, vy) のリストを返す
+        三角関数を使うのは照準の角度を求める1回だけで、弾ごとの向きは回転の掛け算で求める
+        """
+        ax, ay = aim
+        norm = math.hypot(ax, ay)
+        c, s = (ax / norm, -ay / norm) if norm else (1.0, 0.0)
+        base = math.degrees(math.atan2(-ay, ax))
+        return [(shot, base + shot.offset, c * shot.cos - s * shot.sin, -(s * shot.cos + c * shot.sin))
+                for shot in self.shots]
+
+
+class PatternCache:
+    """
+    (パターン名, スキルレベル) -> 事前計算したPattern のキャッシュ
+    スキルを選んだときにcompile()し、発射のたびに角度や性能を計算し直さないようにする
+    """
+    def __init__(self, max_entries: int = MAX_PATTERNS):
+        self.max_entries = max_entries
+        self.patterns: dict[tuple, Pattern] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, name: str, skill: dict[str, int]) -> Pattern:
+        """スキルレベルskillでのパターンnameを返す（初めての組み合わせなら計算する）"""
+        key = (name, tuple(sorted(skill.items())))
+        pattern = self.patterns.get(key)
+        if pattern is not None:
+            self.hits += 1
+            return pattern
+        self.misses += 1
+        spec = PATTERNS[name]
+        stats = {k: level_value(v, skill) for k, v in {**BEAM_STATS, **spec.get("stats", {})}.items()}
+        offsets = SHAPES[spec["shape"]](level_value(spec["count"], skill), level_value(spec["gap"], skill))
+        shots = []
+        for offset in offsets:
+            rad = math.radians(offset)
+            shots.append(Shot(offset, math.cos(rad), math.sin(rad), **stats))
+        if len(self.patterns) >= self.max_entries:
+            self.patterns.clear()
+        pattern = self.patterns[key] = Pattern(name, tuple(shots))
+        return pattern
+
+    def stats(self) -> dict[str, int]:
+        """キャッシュの利用統計を返す"""
+        return {"entries": len(self.patterns), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,126 @@
+import time
+from collections import deque
+
+import pygame as pg
+
+# =====================
+# パフォーマンス計測・表示
+# =====================
+# メインループの処理段階（表示順）
+PHASES = ("events", "spawn", "collide", "update", "draw", "flip", "wait")
+FRAME_WINDOW = 500  # FPS・1% lowの計算に使うフレーム数
+PHASE_WINDOW = 60  # 段階ごとの平均に使うフレーム数
+OVERLAY_INTERVAL = 15  # 表示内容を作り直す間隔[フレーム]
+
+
+class FrameTimer:
+    """
+    1フレームの時間を処理段階ごとに計測するクラス
+    mark(段階名)を呼ぶと、前回のmark()からの時間をその段階に加算する
+    tracerを渡すと、各段階とフレーム全体をトレースの区間としても記録する
+    表示もトレースもしないときは何もしないので、常に呼び出しておいてよい
+    """
+    def __init__(self, enabled: bool = False, tracer=None):
+        self.tracer = tracer
+        self.shown = False  # オーバーレイに表示中か
+        self.enabled = False  # 計測中か（表示中またはトレース中）
+        self.frame_times: deque[float] = deque(maxlen=FRAME_WINDOW)
+        self.phase_times = {p: deque(maxlen=PHASE_WINDOW) for p in PHASES}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.start = self.last = 0.0
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled: bool):
+        """オーバーレイ用の計測を切り替える"""
+        if enabled and not self.shown:
+            self.frame_times.clear()
+            for times in self.phase_times.values():
+                times.clear()
+        self.shown = enabled
+        self.enabled = enabled or self.tracer is not None
+
+    def begin(self):
+        """フレームの開始"""
+        if self.enabled:
+            self.start = self.last = time.perf_counter()
+            for p in self.current:
+                self.current[p] = 0.0
+
+    def mark(self, phase: str):
+        """前回のmark()から今までの時間をphaseに加算する"""
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[phase] += now - self.last
+            if self.tracer is not None:
+                self.tracer.complete(phase, self.last, now)
+            self.last = now
+
+    def end(self):
+        """フレームの終了"""
+        if self.enabled:
+            now = time.perf_counter()
+            if self.tracer is not None:
+                self.tracer.complete("frame", self.start, now, "frame")
+            self.frame_times.append(now - self.start)
+            for p, t in self.current.items():
+                self.phase_times[p].append(t)
+
+    def fps(self) -> float:
+        total = sum(self.frame_times)
+        return len(self.frame_times) / total if total else 0.0
+
+    def low_1pct(self) -> float:
+        """遅い方から1%のフレームの平均時間[秒]"""
+        if not self.frame_times:
+            return 0.0
+        worst = sorted(self.frame_times, reverse=True)[:max(1, len(self.frame_times) // 100)]
+        return sum(worst) / len(worst)
+
+    def phase_ms(self) -> dict[str, float]:
+        """段階ごとの平均時間[ms]"""
+        return {p: 1000 * sum(t) / len(t) if t else 0.0 for p, t in self.phase_times.items()}
+
+
+class PerfOverlay:
+    """FPS・1% low・エンティティ数・段階ごとの時間を画面左下に表示するクラス"""
+    def __init__(self, timer: FrameTimer, pos: tuple[int, int] = (10, 480)):
+        self.timer = timer
+        self.pos = pos
+        self.font = pg.font.Font(None, 20)
+        self.image: pg.Surface | None = None
+        self.count = 0
+
+    @property
+    def visible(self) -> bool:
+        return self.timer.shown
+
+    def toggle(self):
+        self.timer.set_enabled(not self.timer.shown)
+        self.image = None
+
+    def lines(self, counts: dict[str, int], extra: dict[str, object]) -> list[str]:
+        timer = self.timer
+        lines = [f"FPS {timer.fps():5.1f}   1% low {1000 * timer.low_1pct():5.1f} ms"]
+        lines.append("  ".join(f"{k} {v}" for k, v in counts.items()))
+        lines += [f"{p:>8} {ms:6.2f} ms" for p, ms in timer.phase_ms().items()]
+        lines += [f"{k} {v}" for k, v in extra.items()]
+        return lines
+
+    def draw(self, screen: pg.Surface, counts: dict[str, int], extra: dict[str, object] | None = None) -> pg.Rect | None:
+        """表示中ならオーバーレイを描画し、描画した範囲を返す"""
+        if not self.visible:
+            return None
+        # 毎フレーム文字を描き直すと重いので、一定間隔でだけ作り直す
+        if self.image is None or self.count % OVERLAY_INTERVAL == 0:
+            lines = self.lines(counts, extra or {})
+            rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+            w = max(img.get_width() for img in rendered) + 10
+            h = sum(img.get_height() for img in rendered) + 10
+            self.image = pg.Surface((w, h), pg.SRCALPHA)
+            self.image.fill((0, 0, 0, 160))
+            y = 5
+            for img in rendered:
+                self.image.blit(img, (5, y))
+                y += img.get_height()
+        self.count += 1
+        return screen.blit(self.image, self.pos)
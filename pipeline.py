@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import NamedTuple
+
+# =====================
+# 更新と描画のパイプライン（2スレッド）
+# =====================
+
+
+class Snapshot(NamedTuple):
+    """1フレームぶんの描画内容（作ったあとは変更しない）"""
+    state: str  # ゲームの状態（PLAY, SELECT, GAMEOVER）
+    blits: tuple  # (画像, 位置[, 切り出す矩形]) を描く順に並べたもの
+    hud: tuple  # HUDに表示する値
+    counts: tuple  # (グループ名, 数) のタプル（パフォーマンス表示用）
+
+
+class SimThread:
+    """
+    ゲームの更新を別スレッドで行い、描画内容をスナップショットとして受け渡すクラス
+    メインスレッドはsubmit()で次のフレームぶんの更新を頼み、その間に前回のスナップショットを描画する
+    wait()で更新が終わるのを待ってから、次のスナップショットを受け取る
+    スナップショットは2枠（表・裏）で持ち、更新スレッドは裏に書いてから表と入れ替える
+    work: 更新してスナップショットを返す関数（submit()の引数をそのまま渡す）
+    """
+    def __init__(self, work, first: Snapshot):
+        self.work = work
+        self.buffers: list[Snapshot | None] = [first, None]
+        self.front = 0  # 表（描画に使う）の番号
+        self.job: tuple | None = None
+        self.busy = False
+        self.stopped = False
+        self.error: BaseException | None = None
+        self.cond = threading.Condition()
+        self.busy_time = 0.0  # 更新スレッドが更新していた時間[秒]
+        self.wait_time = 0.0  # メインスレッドが更新の終わりを待っていた時間[秒]
+        self.jobs = 0
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def submit(self, *args):
+        """次の更新を頼む（前の更新はwait()で終わらせておくこと）"""
+        with self.cond:
+            if self.busy:
+                raise RuntimeError("previous update is still running")
+            self.job = args
+            self.busy = True
+            self.cond.notify_all()
+
+    def wait(self) -> Snapshot:
+        """頼んだ更新が終わるのを待ち、最新のスナップショットを返す"""
+        t = time.perf_counter()
+        with self.cond:
+            while self.busy:
+                self.cond.wait()
+        self.wait_time += time.perf_counter() - t
+        if self.error is not None:
+            raise self.error
+        return self.buffers[self.front]
+
+    def run(self):
+        while True:
+            with self.cond:
+                while self.job is None and not self.stopped:
+                    self.cond.wait()
+                if self.job is None:
+                    return
+                job, self.job = self.job, None
+            t = time.perf_counter()
+            back = 1 - self.front
+            try:
+                self.buffers[back] = self.work(*job)
+            except BaseException as e:  # メインスレッドのwait()で送出する
+                self.error = e
+            self.busy_time += time.perf_counter() - t
+            with self.cond:
+                if self.error is None:
+                    self.front = back
+                self.jobs += 1
+                self.busy = False
+                self.cond.notify_all()
+
+    def close(self):
+        """更新が終わるのを待ってスレッドを止める"""
+        with self.cond:
+            while self.busy:
+                self.cond.wait()
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    def stats(self) -> dict[str, float]:
+        """更新回数と、更新・待ち時間を返す（更新のうち待たずに済んだ割合がoverlap）"""
+        return {
+            "jobs": self.jobs, "busy_s": round(self.busy_time, 3), "wait_s": round(self.wait_time, 3),
+            "overlap": round(1 - self.wait_time / self.busy_time, 3) if self.busy_time else 0.0,
+        }
@@ -0,0 +1,83 @@
+import pygame as pg
+
+# =====================
+# オブジェクトプール
+# =====================
+
+
+class SpritePool:
+    """
+    kill()されたスプライトを捨てずに保持し、次の生成時に再利用するクラス
+    再利用時はコンストラクタの代わりにreset()を呼んで状態を初期化する
+    """
+    def __init__(self, cls: type, size: int):
+        self.cls = cls
+        self.size = size  # 保持する待機オブジェクトの上限
+        self.free: list[pg.sprite.Sprite] = []
+        self.live = 0        # 使用中の数
+        self.high_water = 0  # 使用中の数の最大値
+        self.created = 0     # 新規生成した数
+        self.reused = 0      # 再利用した数
+        self.dropped = 0     # プールが満杯で捨てた数
+
+    def acquire(self, *args, **kwargs) -> pg.sprite.Sprite:
+        """待機中のオブジェクトがあれば初期化して返し、なければ新しく生成する"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        obj.pooled = False
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+
+    def release(self, obj: pg.sprite.Sprite):
+        """使い終わったオブジェクトをプールに戻す（二重解放は無視する）"""
+        if obj.pooled:
+            return
+        obj.pooled = True
+        self.live -= 1
+        if len(self.free) < self.size:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self) -> dict[str, int]:
+        """プールの利用統計を返す"""
+        return {
+            "size": self.size, "free": len(self.free), "live": self.live,
+            "high_water": self.high_water, "created": self.created,
+            "reused": self.reused, "dropped": self.dropped,
+        }
+
+
+class PooledSprite(pg.sprite.Sprite):
+    """
+    プールから払い出されるスプライトの基底クラス
+    サブクラスは__init__の代わりにreset()で初期化処理を書く
+    """
+    pool: SpritePool | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.pooled = False
+        self.reset(*args, **kwargs)
+
+    def reset(self, *args, **kwargs):
+        raise NotImplementedError
+
+    @classmethod
+    def spawn(cls, *args, **kwargs):
+        """プールがあればプールから、なければ通常通り生成する"""
+        if cls.pool is None:
+            return cls(*args, **kwargs)
+        return cls.pool.acquire(*args, **kwargs)
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
@@ -0,0 +1,239 @@
+
+import pygame as pg
+
+try:
+    import numpy as np
+except ImportError:  # numpyがなければ従来のスプライト版ビームだけを使う
+    np = None
+
+from sprite_cache import SpriteCache
+
+# =====================
+# 構造体配列(SoA)版ビーム
+# =====================
+BEAM_CAPACITY = 1024  # 初期確保数（足りなくなったら倍に増やす）
+BEAM_CELL = 64  # 当たり判定用グリッドのセルの一辺[px]
+GRID_OFFSET = 8  # 画面外のセル番号を負にしないためのずらし量
+GRID_STRIDE = 1 << 12
+
+
+class BeamRef:
+    """
+    BeamArrayの1発分をBeamスプライトと同じ属性名で扱うための参照
+    当たり判定の処理をスプライト版と共通にするために使う
+    """
+    __slots__ = ("beams", "index")
+
+    def __init__(self, beams: "BeamArray", index: int):
+        self.beams = beams
+        self.index = index
+
+    @property
+    def hit_enemies(self) -> set:
+        return self.beams.hit[self.index]
+
+    @property
+    def damage(self) -> int:
+        return int(self.beams.damage[self.index])
+
+    @property
+    def pierce_count(self) -> int:
+        return int(self.beams.pierce[self.index])
+
+    @pierce_count.setter
+    def pierce_count(self, value: int):
+        self.beams.pierce[self.index] = value
+
+    def kill(self):
+        self.beams.alive[self.index] = False
+
+
+class BeamArray:
+    """
+    ビームの位置・速度・反射/貫通の残り回数・攻撃力をnumpy配列で持ち、まとめて更新するクラス
+    Beamスプライトと同じ動き（整数座標での移動、画面端での反射・消滅）をベクトル演算で行う
+    消滅したビームは次のupdate()で詰めて取り除く（順序は発射順のまま）
+    """
+    def __init__(self, image_path: str, sprites: SpriteCache, width: int, height: int,
+                 capacity: int = BEAM_CAPACITY, reflect_path: str | None = None):
+        if np is None:
+            raise RuntimeError("BeamArrayを使うにはnumpyが必要です")
+        self.image_path = image_path
+        # 画像の番号 -> パス（1は上下の端で反射した後の画像、左右の端で反射すると0に戻る）
+        self.paths = (image_path, reflect_path or image_path)
+        self.sprites = sprites
+        self.width = width
+        self.height = height
+        self.n = 0
+        self.left = np.zeros(capacity, np.int64)
+        self.top = np.zeros(capacity, np.int64)
+        self.w = np.zeros(capacity, np.int64)
+        self.h = np.zeros(capacity, np.int64)
+        self.vx = np.zeros(capacity, np.float64)
+        self.vy = np.zeros(capacity, np.float64)
+        self.angle = np.zeros(capacity, np.float64)
+        self.speed = np.zeros(capacity, np.int64)
+        self.damage = np.zeros(capacity, np.int64)
+        self.reflect = np.zeros(capacity, np.int64)
+        self.pierce = np.zeros(capacity, np.int64)
+        self.alive = np.zeros(capacity, bool)
+        self.look = np.zeros(capacity, np.int64)  # 使う画像の番号（self.pathsの添字）
+        self.hit: list[set] = []  # 多段ヒット防止用セット（ビームごと）
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.alive[:self.n]))
+
+    def arrays(self) -> list:
+        return [self.left, self.top, self.w, self.h, self.vx, self.vy, self.angle,
+                self.speed, self.damage, self.reflect, self.pierce, self.alive, self.look]
+
+    def grow(self):
+        """配列の容量を倍にする"""
+        cap = len(self.left) * 2
+        for name in ("left", "top", "w", "h", "vx", "vy", "angle", "speed", "damage", "reflect", "pierce", "alive", "look"):
+            old = getattr(self, name)
+            new = np.zeros(cap, old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def spawn(self, bird: pg.sprite.Sprite, shot, angle: float, vx: float, vy: float):
+        """
+        Beamスプライトと同じ位置・速度・性能でビームを1発追加する
+        shot: 発射パターンの1発（patterns.Shot）、angle・vx・vy: 照準の向きに回した角度と単位ベクトル
+        """
+        if self.n == len(self.left):
+            self.grow()
+        i = self.n
+        rect = self.sprites.rotated(self.image_path, angle).get_rect()
+        rect.centerx = bird.rect.centerx + bird.rect.width * vx * 0.5
+        rect.centery = bird.rect.centery + bird.rect.height * vy * 0.5
+        self.left[i], self.top[i], self.w[i], self.h[i] = rect
+        self.vx[i], self.vy[i], self.angle[i] = vx, vy, angle
+        self.speed[i] = shot.speed
+        self.damage[i] = shot.damage
+        self.reflect[i] = shot.reflect
+        self.pierce[i] = shot.pierce
+        self.alive[i] = True
+        self.look[i] = 0
+        self.hit.append(set())
+        self.n += 1
+
+    def compact(self):
+        """消滅したビームを取り除いて詰める"""
+        n = self.n
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        m = len(keep)
+        for arr in self.arrays():
+            arr[:m] = arr[keep]
+            arr[m:n] = 0
+        self.hit = [self.hit[i] for i in keep]
+        self.n = m
+
+    def update(self):
+        """全ビームを移動させ、画面端で反射または消滅させる"""
+        self.compact()
+        n = self.n
+        if n == 0:
+            return
+        left, top = self.left[:n], self.top[:n]
+        vx, vy, angle = self.vx[:n], self.vy[:n], self.angle[:n]
+        reflect, alive, look = self.reflect[:n], self.alive[:n], self.look[:n]
+        speed = self.speed[:n]
+        # Rect.move_ipと同じく移動量は0方向に切り捨てる
+        left += np.trunc(speed * vx).astype(np.int64)
+        top += np.trunc(speed * vy).astype(np.int64)
+
+        # 横方向のはみ出し
+        out = (left < 0) | (left + self.w[:n] > self.width)
+        bounce = out & (reflect > 0)
+        vx[bounce] *= -1
+        reflect[bounce] -= 1
+        angle[bounce] = 180 - angle[bounce]
+        look[bounce] = 0
+        alive[out & ~bounce] = False
+
+        # 縦方向のはみ出し
+        out = (top < 0) | (top + self.h[:n] > self.height)
+        bounce = out & (reflect > 0)
+        vy[bounce] *= -1
+        reflect[bounce] -= 1
+        angle[bounce] = -angle[bounce]
+        look[bounce] = 1
+        alive[out & ~bounce] = False
+
+    def blit_items(self) -> list[tuple]:
+        """生きているビームを描くための(画像, 位置[, 切り出す矩形])のリストを返す"""
+        idx = np.flatnonzero(self.alive[:self.n])
+        if len(idx) == 0:
+            return []
+        sprites = self.sprites
+        paths = self.paths
+        images = {}  # (画像の番号, 回転バケット) -> (blit元, 切り出す矩形)
+        items = []
+        for a, k, x, y in zip(self.angle[idx].tolist(), self.look[idx].tolist(),
+                              self.left[idx].tolist(), self.top[idx].tolist()):
+            b = (k, sprites.bucket(a))
+            src = images.get(b)
+            if src is None:
+                img = sprites.rotated(paths[k], a)
+                src = images[b] = sprites.atlas.source(img) if sprites.atlas is not None else (img, None)
+            items.append((src[0], (x, y), src[1]))
+        return items
+
+    def groupcollide(self, group, masks=None) -> dict:
+        """
+        groupのスプライトと重なっている生きたビームを{スプライト: [BeamRef, ...]}で返す
+        pg.sprite.groupcollide(group, beams)と同じく、キーはgroupの順、リストは発射順に並ぶ
+        masks: collision.MaskCacheを渡すと、矩形が重なったビームだけピクセル単位でも判定する
+        """
+        idx = np.flatnonzero(self.alive[:self.n])
+        if len(idx) == 0 or not group:
+            return {}
+        left, top = self.left[idx], self.top[idx]
+        right, bottom = left + self.w[idx], top + self.h[idx]
+        max_w, max_h = int(self.w[idx].max()), int(self.h[idx].max())
+
+        # ビームの左上の座標が入るセルでソートしておき、各スプライトの周辺セルだけを調べる
+        cs = BEAM_CELL
+        cx = np.clip(left // cs + GRID_OFFSET, 0, GRID_STRIDE - 1)
+        cy = np.clip(top // cs + GRID_OFFSET, 0, GRID_STRIDE - 1)
+        keys = cy * GRID_STRIDE + cx
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+
+        hits = {}
+        refs = {}
+        for sprite in group:
+            r = sprite.rect
+            x0 = min(max((r.left - max_w) // cs + GRID_OFFSET, 0), GRID_STRIDE - 1)
+            x1 = min(max((r.right - 1) // cs + GRID_OFFSET, 0), GRID_STRIDE - 1)
+            y0 = min(max((r.top - max_h) // cs + GRID_OFFSET, 0), GRID_STRIDE - 1)
+            y1 = min(max((r.bottom - 1) // cs + GRID_OFFSET, 0), GRID_STRIDE - 1)
+            rows = np.arange(y0, y1 + 1) * GRID_STRIDE
+            lo = np.searchsorted(keys, rows + x0, "left")
+            hi = np.searchsorted(keys, rows + x1, "right")
+            if not (hi > lo).any():
+                continue
+            cand = order[np.concatenate([np.arange(a, b) for a, b in zip(lo, hi) if b > a])]
+            hit = cand[(left[cand] < r.right) & (right[cand] > r.left)
+                       & (top[cand] < r.bottom) & (bottom[cand] > r.top)]
+            if len(hit) == 0 or r.width == 0 or r.height == 0:
+                continue
+            hit.sort()
+            hit = idx[hit].tolist()
+            if masks is not None:
+                hit = [j for j in hit if masks.overlap(
+                    sprite.image, r.topleft, self.sprites.rotated(self.paths[self.look[j]], float(self.angle[j])),
+                    (int(self.left[j]), int(self.top[j])))]
+                if not hit:
+                    continue
+            lst = []
+            for j in hit:
+                ref = refs.get(j)
+                if ref is None:
+                    ref = refs[j] = BeamRef(self, j)
+                lst.append(ref)
+            hits[sprite] = lst
+        return hits
@@ -0,0 +1,48 @@
+import pygame as pg
+
+# =====================
+# 描画パイプライン（差分更新）
+# =====================
+RENDER_MODES = ("dirty", "full")
+MAX_DIRTY_RECTS = 400  # これより多く描いたフレームは画面全体を更新する
+
+
+class Renderer:
+    """
+    背景の塗り直しと画面の更新を受け持つクラス
+    mode="dirty": 前フレームと今フレームに描いた矩形だけを背景で塗り直し、その部分だけ画面を更新する
+    mode="full": 毎フレーム背景全体を描き直し、画面全体を更新する（比較用）
+    """
+    def __init__(self, screen: pg.Surface, bg_img: pg.Surface, mode: str = "dirty"):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"unknown render mode: {mode}")
+        self.screen = screen
+        self.bg_img = bg_img
+        self.mode = mode
+        self.prev_rects: list[pg.Rect] = []
+        self.full_frames = 1  # 画面全体を描き直す残りフレーム数
+
+    def invalidate(self):
+        """今フレームと次フレームは画面全体を描き直す（オーバーレイ表示中など）"""
+        self.full_frames = 2
+
+    def clear(self):
+        """前フレームの描画を背景で消す"""
+        if self.mode == "full" or self.full_frames:
+            self.screen.blit(self.bg_img, (0, 0))
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(self.bg_img, rect, rect)
+
+    def present(self, rects: list[pg.Rect]):
+        """
+        画面を更新する
+        rects: 今フレームに描いた矩形（次フレームのclear()で背景に戻す）
+        """
+        if self.mode == "full" or self.full_frames or len(rects) + len(self.prev_rects) > MAX_DIRTY_RECTS:
+            pg.display.update()
+        else:
+            pg.display.update(self.prev_rects + rects)
+        if self.full_frames:
+            self.full_frames -= 1
+        self.prev_rects = rects
@@ -0,0 +1,151 @@
+import struct
+
+import pygame as pg
+
+from headless import KeyState, NullInput
+
+# =====================
+# 入力の記録・再生
+# =====================
+# ファイルの形式（リトルエンディアン）
+#   ヘッダ: マジック"KKRP", バージョン, シード, ステップ数, スコア
+#   キー表: キーの数, キーコード...（キー状態のビットの並び）
+#   キー状態: 区間の数, (ビットマスク, 続いたステップ数)...（ランレングス圧縮）
+#   スキル選択: 選択の数, (ステップ番号, 名前の長さ, 名前)...
+MAGIC = b"KKRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHqIi")  # シードは符号付き64bit
+RUN = struct.Struct("<BI")
+CHOICE = struct.Struct("<IB")
+COUNT = struct.Struct("<I")
+
+
+class ReplayDiverged(ValueError):
+    """再生中のゲームが記録と食い違った（記録時と違う設定で再生したなど）"""
+    def __init__(self, step: int, detail: str):
+        super().__init__(f"replay diverged at step {step}: {detail}")
+        self.step = step
+# 記録するキー（Legend_kokaton.pyはWASD、musou_kokaton.pyは矢印キーで移動する）
+REPLAY_KEYS = (pg.K_w, pg.K_a, pg.K_s, pg.K_d, pg.K_UP, pg.K_DOWN, pg.K_LEFT, pg.K_RIGHT)
+
+
+class Recorder:
+    """
+    シードと、ステップごとのキー状態・スキル選択を記録してファイルに保存するクラス
+    キー状態はREPLAY_KEYSの押下をビットマスクにし、同じ状態が続く区間をまとめて持つ
+    """
+    def __init__(self, seed: int, keys: tuple[int, ...] = REPLAY_KEYS):
+        if not -(1 << 63) <= seed < 1 << 63:
+            # 保存するときに失敗して記録が失われないよう、始める前に確かめる
+            raise ValueError(f"seed out of range for recording: {seed}")
+        self.seed = seed
+        self.key_codes = keys
+        self.runs: list[list[int]] = []  # [ビットマスク, 続いたステップ数]
+        self.choices: list[tuple[int, str]] = []  # (ステップ番号, スキル名)
+        self.steps = 0
+
+    def record_keys(self, step: int, key_lst):
+        """stepのキー状態を記録する（ステップは0から順に1回ずつ呼ぶ）"""
+        if step != self.steps:
+            raise ValueError(f"step {step} recorded out of order (expected {self.steps})")
+        mask = 0
+        for i, k in enumerate(self.key_codes):
+            if key_lst[k]:
+                mask |= 1 << i
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.steps += 1
+
+    def record_choice(self, step: int, skill: str):
+        """stepの直前に選んだスキルを記録する"""
+        self.choices.append((step, skill))
+
+    def save(self, path: str, score: int = 0):
+        """記録をファイルに書き出す（scoreは再生時の検証用）"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.steps, score))
+            f.write(COUNT.pack(len(self.key_codes)))
+            f.write(struct.pack(f"<{len(self.key_codes)}I", *self.key_codes))
+            f.write(COUNT.pack(len(self.runs)))
+            for mask, length in self.runs:
+                f.write(RUN.pack(mask, length))
+            f.write(COUNT.pack(len(self.choices)))
+            for step, skill in self.choices:
+                name = skill.encode("utf-8")
+                f.write(CHOICE.pack(step, len(name)))
+                f.write(name)
+
+
+class ReplayInput(NullInput):
+    """
+    Recorderで保存したファイルを読み込み、記録どおりのキー状態とスキル選択を返す入力
+    keys()はステップ番号で引くので、1回の描画で進めるステップ数が変わっても同じ結果になる
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            self.load(data, path)
+        except struct.error:  # 途中で切れたファイルなど
+            raise ValueError(f"bad replay file: {path}") from None
+        self.next_choice = 0
+        self.played = 0  # 再生したステップ数
+
+    def load(self, data: bytes, path: str):
+        """ファイルの内容を読み取る"""
+        magic, version, self.seed, self.steps, self.score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a replay file: {path}")
+        offset = HEADER.size
+        (n,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        self.key_codes = struct.unpack_from(f"<{n}I", data, offset)
+        offset += 4 * n
+
+        # ステップごとのキー状態に展開しておく
+        (n,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        states: dict[int, KeyState] = {}
+        self.masks: list[KeyState] = []
+        for _ in range(n):
+            mask, length = RUN.unpack_from(data, offset)
+            offset += RUN.size
+            state = states.get(mask)
+            if state is None:
+                state = states[mask] = KeyState(k for i, k in enumerate(self.key_codes) if mask >> i & 1)
+            self.masks += [state] * length
+        if len(self.masks) != self.steps:
+            raise ValueError(f"broken replay file: {path}")
+
+        (n,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        self.choices: list[tuple[int, str]] = []
+        for _ in range(n):
+            step, size = CHOICE.unpack_from(data, offset)
+            offset += CHOICE.size
+            self.choices.append((step, data[offset:offset + size].decode("utf-8")))
+            offset += size
+
+    def keys(self, frame: int) -> KeyState:
+        self.played = max(self.played, frame + 1)
+        if frame < len(self.masks):
+            return self.masks[frame]
+        return KeyState()
+
+    def choose(self, choices: list[str]) -> str:
+        if self.next_choice >= len(self.choices):
+            raise ReplayDiverged(self.played, "no more skill choices recorded")
+        step, skill = self.choices[self.next_choice]
+        self.next_choice += 1
+        if skill not in choices:
+            raise ReplayDiverged(step, f"{skill} not in {choices}")
+        return skill
+
+    def finished(self, step: int) -> bool:
+        return step >= self.steps
+
+    def verify(self, score: int) -> bool:
+        """記録した全ステップを再生し、同じスコアになったかを返す"""
+        return self.played == self.steps and score == self.score
@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict
+
+import pygame as pg
+
+# =====================
+# 画像キャッシュ
+# =====================
+ANGLE_BUCKETS = 720  # 回転角の分割数（720で0.5度刻み）
+MAX_VARIANTS = 4096  # 変形済み画像の保持上限
+
+
+class SpriteCache:
+    """
+    画像アセットを一度だけ読み込み、回転・拡大縮小・反転した画像を共有するクラス
+    回転角はANGLE_BUCKETS段階に量子化し、変形済み画像はLRUで破棄する
+    convert()の後は、すべての画像を画面と同じピクセル形式に変換して持つ（描画時の変換を省く）
+    use_atlas()の時点で揃っている画像（読み込んだ画像と起動時に作った変形済み画像）だけをアトラスに詰める
+    その後に作る画像（ビームの回転画像など）は詰めないので、アトラスの大きさは起動時の画像の分で決まる
+    画像の読み込み・変形と破棄、アトラスへの詰め込みはロックで守るので、更新スレッドからも使える
+    """
+    def __init__(self, buckets: int = ANGLE_BUCKETS, max_variants: int = MAX_VARIANTS):
+        self.buckets = buckets
+        self.max_variants = max_variants
+        self.images: dict[object, pg.Surface] = {}  # 元画像・生成した画像（破棄しない）
+        self.variants: OrderedDict[tuple, pg.Surface] = OrderedDict()
+        self.display = False  # 画面の形式に変換するか
+        self.atlas = None  # 画像を詰めるアトラス（Noneなら使わない）
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def to_display(self, img: pg.Surface) -> pg.Surface:
+        """
+        convert()の後なら画像を画面の形式に変換して返す
+        透明度・透明色付きの画像はconvert_alphaで変換する（透明色のままだと回転・拡大で背景が残るため）
+        """
+        if not self.display:
+            return img
+        if img.get_flags() & pg.SRCALPHA or img.get_colorkey() is not None:
+            img = img.convert_alpha()
+        else:
+            img = img.convert()
+        return img
+
+    def convert(self):
+        """
+        読み込み済みの画像と変形済み画像を画面の形式に変換する（pg.display.set_mode()の後に呼ぶ）
+        以後に読み込む画像・作る画像も変換する
+        """
+        if self.display:
+            return
+        with self.lock:
+            self.display = True
+            for key, img in self.images.items():
+                self.images[key] = self.to_display(img)
+            for key, img in self.variants.items():
+                self.variants[key] = self.to_display(img)
+
+    def use_atlas(self, atlas):
+        """変換済みの画像をatlasに詰める（convert()の後に呼ぶ、Noneで使うのをやめる）"""
+        with self.lock:
+            self.atlas = atlas
+            if atlas is not None:
+                atlas.pack([*self.images.values(), *self.variants.values()])
+
+    def add(self, path: str, img: pg.Surface) -> pg.Surface:
+        """読み込んだ画像を登録する"""
+        img = self.images[path] = self.to_display(img)
+        return img
+
+    def load(self, path: str) -> pg.Surface:
+        """画像を読み込む（2回目以降はキャッシュを返す）"""
+        img = self.images.get(path)
+        if img is None:
+            with self.lock:
+                img = self.images.get(path) or self.add(path, pg.image.load(path))
+        return img
+
+    def generate(self, key: tuple, make) -> pg.Surface:
+        """make()で作った画像をkeyごとに共有する（図形など、ファイルでない画像用）"""
+        img = self.images.get(key)
+        if img is None:
+            with self.lock:
+                img = self.images.get(key) or self.to_display(make())
+                self.images[key] = img
+        return img
+
+    def bucket(self, angle: float) -> int:
+        """角度[度]を回転バケット番号に変換する"""
+        return round(angle * self.buckets / 360) % self.buckets
+
+    def bucket_angle(self, bucket: int) -> float:
+        """回転バケット番号を代表角度[度]に戻す"""
+        return bucket * 360 / self.buckets
+
+    def variant(self, path: str, *ops: tuple) -> pg.Surface:
+        """
+        元画像にopsを順に適用した画像を返す
+        ops: ("zoom", 角度, 倍率) / ("flip", 横反転, 縦反転)
+        途中段階の画像もキャッシュされるため、共通の前処理は一度しか行わない
+        """
+        if not ops:
+            return self.load(path)
+        key = (path, *ops)
+        with self.lock:
+            img = self.variants.get(key)
+            if img is not None:
+                self.hits += 1
+                self.variants.move_to_end(key)
+                return img
+
+            self.misses += 1
+            src = self.variant(path, *ops[:-1])
+            op = ops[-1]
+            if op[0] == "zoom":
+                img = pg.transform.rotozoom(src, op[1], op[2])
+            elif op[0] == "flip":
+                img = pg.transform.flip(src, op[1], op[2])
+            else:
+                raise ValueError(f"unknown transform: {op[0]}")
+
+            img = self.variants[key] = self.to_display(img)
+            if len(self.variants) > self.max_variants:
+                _, old = self.variants.popitem(last=False)
+                if self.atlas is not None:
+                    self.atlas.remove(old)  # 作り直したときに別の画像として二重に詰めないように索引からも消す
+            return img
+
+    def rotated(self, path: str, angle: float, scale: float = 1.0) -> pg.Surface:
+        """角度を量子化したうえで回転・拡大縮小済みの画像を返す"""
+        return self.variant(path, ("zoom", self.bucket_angle(self.bucket(angle)), scale))
+
+    def stats(self) -> dict[str, int]:
+        """キャッシュの利用統計を返す"""
+        return {"images": len(self.images), "variants": len(self.variants), "display": int(self.display),
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,138 @@
+import heapq
+from collections import defaultdict
+
+import pygame as pg
+
+# =====================
+# オートエイム用ターゲット管理
+# =====================
+TARGET_CELL = 96  # セルの一辺[px]
+
+
+class TargetGroup(pg.sprite.Group):
+    """
+    狙えるスプライト（敵・爆弾）を中心座標のグリッドで管理するグループ
+    出現時にadd()し、kill()されると自動的に外れる
+    最近傍・k近傍の検索は近いセルから順に調べ、それ以上近い候補がなくなった時点で打ち切る
+    """
+    def __init__(self, *sprites, cell_size: int = TARGET_CELL):
+        self.cell_size = cell_size
+        self.cells: defaultdict[tuple[int, int], set] = defaultdict(set)
+        self.where: dict[pg.sprite.Sprite, tuple[int, int]] = {}
+        self.order: dict[pg.sprite.Sprite, int] = {}  # 同距離のときは先に追加された方を優先
+        self.seq = 0
+        super().__init__(*sprites)
+
+    def cell_of(self, pos: tuple[int, int]) -> tuple[int, int]:
+        return pos[0] // self.cell_size, pos[1] // self.cell_size
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if sprite in self.where:
+            return
+        cell = self.cell_of(sprite.rect.center)
+        self.where[sprite] = cell
+        self.order[sprite] = self.seq
+        self.seq += 1
+        self.cells[cell].add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        cell = self.where.pop(sprite, None)
+        if cell is not None:
+            del self.order[sprite]
+            self.discard(sprite, cell)
+
+    def discard(self, sprite: pg.sprite.Sprite, cell: tuple[int, int]):
+        bucket = self.cells[cell]
+        bucket.discard(sprite)
+        if not bucket:
+            del self.cells[cell]
+
+    def rebin(self):
+        """移動によってセルが変わったスプライトだけ登録し直す"""
+        for sprite, old in self.where.items():
+            cell = self.cell_of(sprite.rect.center)
+            if cell != old:
+                self.discard(sprite, old)
+                self.cells[cell].add(sprite)
+                self.where[sprite] = cell
+
+    def ring(self, center: tuple[int, int], r: int):
+        """centerからチェビシェフ距離がちょうどrのセルに入っているスプライトを列挙する"""
+        cx, cy = center
+        cells = self.cells
+        if r == 0:
+            yield from cells.get(center, ())
+            return
+        for x in range(cx - r, cx + r + 1):
+            for y in (cy - r, cy + r):
+                yield from cells.get((x, y), ())
+        for y in range(cy - r + 1, cy + r):
+            for x in (cx - r, cx + r):
+                yield from cells.get((x, y), ())
+
+    def reach(self, center: tuple[int, int], pos: tuple[int, int], r: int) -> int:
+        """リングr（r>=1）上の点までの距離の2乗の下限（posからリングr-1までの正方形の辺までの距離）"""
+        cs = self.cell_size
+        cx, cy = center
+        px, py = pos
+        d = min(px - (cx - r + 1) * cs, (cx + r) * cs - px, py - (cy - r + 1) * cs, (cy + r) * cs - py)
+        return d * d
+
+    def k_nearest(self, pos: tuple[int, int], k: int) -> list[pg.sprite.Sprite]:
+        """posに近い順にk個のスプライトを返す"""
+        if k <= 0 or not self.where:
+            return []
+        center = self.cell_of(pos)
+        px, py = pos
+        order = self.order
+        best = []  # (-距離, -追加順, スプライト) のヒープ（先頭が最も遠い候補）
+        worst = None  # k個そろったときの最も遠い候補の距離の2乗
+        seen = 0
+        r = 0
+        while seen < len(self.where):
+            # リングr上の点はどれもworstより遠ければ、それ以上外側を調べても入れ替わらない
+            if worst is not None and self.reach(center, pos, r) > worst:
+                break
+            for t in self.ring(center, r):
+                seen += 1
+                dx = t.rect.centerx - px
+                dy = t.rect.centery - py
+                d = dx*dx + dy*dy
+                if worst is not None and d > worst:
+                    continue  # 明らかに遠い候補はヒープの要素を作らずに捨てる
+                item = (-d, -order[t], t)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                    if len(best) < k:
+                        continue
+                elif item[:2] > best[0][:2]:
+                    heapq.heapreplace(best, item)
+                else:
+                    continue
+                worst = -best[0][0]
+            r += 1
+        return [t for _, _, t in sorted(best, key=lambda item: item[:2], reverse=True)]
+
+    def nearest(self, pos: tuple[int, int]) -> pg.sprite.Sprite | None:
+        """posに一番近いスプライトを返す（いなければNone、k_nearest(pos, 1)と同じ結果をヒープなしで求める）"""
+        center = self.cell_of(pos)
+        px, py = pos
+        order = self.order
+        found = None
+        best = best_order = 0
+        seen = 0
+        r = 0
+        while seen < len(self.where):
+            if found is not None and self.reach(center, pos, r) > best:
+                break
+            for t in self.ring(center, r):
+                seen += 1
+                dx = t.rect.centerx - px
+                dy = t.rect.centery - py
+                d = dx*dx + dy*dy
+                if found is None or d < best or (d == best and order[t] < best_order):
+                    found, best, best_order = t, d, order[t]
+            r += 1
+        return found
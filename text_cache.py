@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pygame as pg
+
+# =====================
+# 文字描画キャッシュ
+# =====================
+MAX_TEXTS = 256  # 描画済み文字列の保持上限
+FONT_CACHE_FILE = ".cache/fonts.json"  # システムフォントの検索結果の保存先
+
+
+class TextCache:
+    """
+    フォントを共有し、描画済みの文字列画像を(フォント, サイズ, 文字列, 色, アンチエイリアス)ごとに使い回すクラス
+    値が変わらない限りHUDやポップアップの文字は再描画しない（古いものからLRUで破棄する）
+    システムフォントの検索結果はfont_cache_fileに保存し、次回起動時は検索しない
+    フォントの作成と文字の描画はロックで守るので、更新スレッドからも使える
+    """
+    def __init__(self, max_entries: int = MAX_TEXTS, font_cache_file: str | None = FONT_CACHE_FILE):
+        self.max_entries = max_entries
+        self.font_cache_file = font_cache_file
+        self.fonts: dict[tuple[str | None, int], pg.font.Font] = {}
+        self.sysfonts: dict[str, str] | None = None  # フォント名の候補 -> ファイルのパス
+        self.missing: set[str] = set()  # 見つからなかったフォント名の候補（ファイルには保存しない）
+        self.sysfont_hits: dict[str, bool] = {}  # 見つかったフォント名の候補 -> 初回の検索でファイルの保存結果を使えたか
+        self.surfaces: OrderedDict[tuple, pg.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def font(self, name: str | None, size: int) -> pg.font.Font:
+        """フォントを返す（name: フォントファイルのパス、Noneならpygame標準フォント）"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            with self.lock:
+                font = self.fonts.get(key) or pg.font.Font(name, size)
+                self.fonts[key] = font
+        return font
+
+    def load_sysfonts(self) -> dict[str, str]:
+        """保存済みのシステムフォント検索結果を読み込む（初回のみ、見つからなかった結果は読まない）"""
+        if self.sysfonts is None:
+            self.sysfonts = {}
+            if self.font_cache_file and os.path.exists(self.font_cache_file):
+                try:
+                    with open(self.font_cache_file, encoding="utf-8") as f:
+                        self.sysfonts = {k: v for k, v in json.load(f).items() if v}
+                except (OSError, ValueError):
+                    pass
+        return self.sysfonts
+
+    def sysfont_path(self, names: list[str]) -> str | None:
+        """
+        namesの順にシステムフォントを探し、見つかったファイルのパスを返す（なければNone）
+        フォントディレクトリの走査は遅いため、結果をメモリとファイルに保存して使い回す
+        見つからなかった結果はファイルに保存しない（あとでフォントを入れたら次の起動で見つかる）
+        """
+        sysfonts = self.load_sysfonts()
+        key = ",".join(names)
+        path = sysfonts.get(key)
+        if path is not None and os.path.exists(path):
+            self.sysfont_hits.setdefault(key, True)
+            return path
+        if key in self.missing:
+            return None
+        path = pg.font.match_font(names)
+        if path is None:
+            self.missing.add(key)
+            return None
+        self.sysfont_hits.setdefault(key, False)
+        sysfonts[key] = path
+        if self.font_cache_file:
+            try:
+                os.makedirs(os.path.dirname(self.font_cache_file) or ".", exist_ok=True)
+                with open(self.font_cache_file, "w", encoding="utf-8") as f:
+                    json.dump(sysfonts, f, ensure_ascii=False, indent=2)
+            except OSError:
+                pass
+        return path
+
+    def sysfont(self, names: list[str], size: int) -> pg.font.Font:
+        """pg.font.SysFontの代わり（見つからなければpygame標準フォント）"""
+        return self.font(self.sysfont_path(names), size)
+
+    def render(self, text: str, size: int, color, name: str | None = None, antialias: bool = True) -> pg.Surface:
+        """文字列を描画した画像を返す（同じ条件で描画済みならキャッシュを返す）"""
+        key = (name, size, text, tuple(color), bool(antialias))
+        with self.lock:
+            img = self.surfaces.get(key)
+            if img is not None:
+                self.hits += 1
+                self.surfaces.move_to_end(key)
+                return img
+            self.misses += 1
+            img = self.font(name, size).render(text, antialias, color)
+            self.surfaces[key] = img
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+            return img
+
+    def stats(self) -> dict[str, int]:
+        """キャッシュの利用統計を返す"""
+        return {"entries": len(self.surfaces), "fonts": len(self.fonts), "hits": self.hits, "misses": self.misses}
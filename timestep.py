@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+import pygame as pg
+
+# =====================
+# 固定タイムステップ
+# =====================
+STEP = 1 / 50  # シミュレーション1ステップの長さ[秒]（移動量・出現間隔はこの単位）
+MAX_STEPS = 5  # 1回の描画あたりに追いつくために進める最大ステップ数
+
+
+class FixedTimestep:
+    """
+    実際の経過時間をためておき、固定長のステップ何回ぶんに当たるかを返すクラス
+    描画が遅れても同じ時間だけゲームが進むため、ゲーム速度がフレームレートに左右されない
+    """
+    def __init__(self, step: float = STEP, max_steps: int = MAX_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0  # 追いつけずに捨てた時間[秒]
+
+    def advance(self, dt: float) -> int:
+        """経過時間dt[秒]を加え、今回進めるステップ数を返す"""
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        if steps > self.max_steps:
+            # 処理落ちが続くと際限なく遅れるので、追いつけないぶんは捨てる
+            self.dropped += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        return steps
+
+    def reset(self):
+        """ためた時間を捨てる（一時停止から戻ったときなど）"""
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self) -> float:
+        """次のステップまでの進み具合（0〜1、描画の補間に使う）"""
+        return min(self.accumulator / self.step, 1.0)
+
+
+@contextmanager
+def interpolated(prev_pos: dict[pg.sprite.Sprite, tuple[int, int]], alpha: float):
+    """
+    withブロックの間だけ、スプライトを直前のステップと現在の位置の間（割合alpha）に移動させる
+    prev_pos: {スプライト: ステップ開始時のrect.topleft}
+    """
+    moved = []
+    for sprite, (px, py) in prev_pos.items():
+        x, y = sprite.rect.topleft
+        if (x, y) != (px, py):
+            moved.append((sprite, x, y))
+            sprite.rect.topleft = round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+    try:
+        yield
+    finally:
+        for sprite, x, y in moved:
+            sprite.rect.topleft = x, y
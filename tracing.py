@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# =====================
+# 処理時間のトレース出力
+# =====================
+TRACE_FORMATS = ("chrome", "jsonl")
+FLUSH_INTERVAL = 0.5  # 書き出し間隔[秒]
+MAX_BUFFER = 1_000_000  # 書き出し待ちイベントの上限（超えたら古いものから捨てる）
+
+
+class NullTracer:
+    """トレースしないときの代わり（何も記録しない）"""
+    enabled = False
+
+    def span(self, name: str):
+        return nullcontext()
+
+    def complete(self, name: str, start: float, end: float, cat: str = "phase"):
+        pass
+
+    def close(self):
+        pass
+
+
+class Tracer:
+    """
+    区間（span）の開始時刻と長さをバッファにため、バックグラウンドのスレッドでファイルに書き出すクラス
+    format="chrome": Chromeのトレースビューア（chrome://tracing, Perfetto）で読めるJSON配列
+    format="jsonl": 1行に1イベントのJSON
+    時刻はperf_counter基準で、トレース開始からのマイクロ秒
+    """
+    enabled = True
+
+    def __init__(self, path: str, format: str = "chrome", flush_interval: float = FLUSH_INTERVAL):
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"unknown trace format: {format}")
+        self.path = path
+        self.format = format
+        self.flush_interval = flush_interval
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.buffer: deque[tuple] = deque(maxlen=MAX_BUFFER)
+        self.written = 0
+        self.file = open(path, "w", encoding="utf-8")
+        if format == "chrome":
+            self.file.write("[\n")
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="trace-writer", daemon=True)
+        self.thread.start()
+
+    @contextmanager
+    def span(self, name: str, cat: str = "span"):
+        """withブロックの実行時間を1つのイベントとして記録する"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, start, time.perf_counter(), cat)
+
+    def complete(self, name: str, start: float, end: float, cat: str = "phase"):
+        """start〜end（perf_counterの値）の区間を記録する"""
+        self.buffer.append((name, cat, start, end, threading.get_ident()))
+
+    def run(self):
+        while not self.stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """たまったイベントをファイルに書き出す"""
+        lines = []
+        origin, pid = self.origin, self.pid
+        buffer = self.buffer
+        while buffer:
+            name, cat, start, end, tid = buffer.popleft()
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((start - origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+            }
+            lines.append(json.dumps(event, separators=(",", ":")))
+        if not lines:
+            return
+        if self.format == "chrome":
+            text = ",\n".join(lines)
+            if self.written:
+                text = ",\n" + text
+        else:
+            text = "\n".join(lines) + "\n"
+        self.file.write(text)
+        self.file.flush()
+        self.written += len(lines)
+
+    def close(self):
+        """書き出しスレッドを止め、残りを書き出してファイルを閉じる"""
+        if self.file.closed:
+            return
+        self.stop.set()
+        self.thread.join()
+        self.flush()
+        if self.format == "chrome":
+            self.file.write("\n]\n")
+        self.file.close()